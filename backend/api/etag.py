@@ -0,0 +1,37 @@
+"""
+ETag helpers for cacheable JSON responses.
+"""
+
+import hashlib
+
+from fastapi import Request, Response
+
+
+def compute_etag(body: bytes) -> str:
+    """Strong ETag for a response body"""
+    return f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the client's If-None-Match already covers *etag*"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in candidates
+
+
+def json_etag_response(request: Request, body: bytes, etag: str | None = None) -> Response:
+    """Serve pre-encoded JSON with a weak ETag, or a bare 304 when the client has it
+
+    The ETag is weak because the bytes on the wire are not *body*: they are
+    wrapped in the unified envelope and may be gzipped.
+    """
+    etag = etag or compute_etag(body)
+    headers = {"ETag": f"W/{etag}", "Cache-Control": "no-cache"}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
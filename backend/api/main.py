@@ -2,7 +2,9 @@
 FastAPI application main file.
 """
 
+import asyncio
 import logging
+import os
 from contextlib import asynccontextmanager
 from pathlib import Path
 
@@ -15,8 +17,13 @@ from alembic import command  # noqa: E402
 from alembic.config import Config  # noqa: E402
 from fastapi import FastAPI  # noqa: E402
 from fastapi.middleware.cors import CORSMiddleware  # noqa: E402
+from fastapi.responses import ORJSONResponse  # noqa: E402
 
-from api.middleware import UnifiedResponseMiddleware  # noqa: E402
+from api.middleware import (  # noqa: E402
+    SelectiveGZipMiddleware,
+    UnifiedResponseMiddleware,
+    register_exception_handlers,
+)
 from api.routes import (  # noqa: E402
     chats,
     chats_trace,
@@ -29,6 +36,7 @@ from api.routes import (  # noqa: E402
 )
 from api.state import AppState, get_app_state_direct, set_app_state  # noqa: E402
 from config import get_config, load_config_from_db  # noqa: E402
+from database.connection import warmup_pool  # noqa: E402
 
 logger = logging.getLogger(__name__)
 
@@ -46,22 +54,19 @@ async def lifespan(app: FastAPI):
 
         configure_logging(bootstrap_config)
 
-        # 重新获取 logger，确保使用新配置
-        global logger
-        import logging
-        logger = logging.getLogger(__name__)
-
         # Run database migrations
         logger.info("Running database migrations...")
+        # Startup work below is blocking (DB / filesystem), so it runs in a worker
+        # thread to keep the event loop free while the server comes up
         alembic_cfg = Config("alembic.ini")
-        command.upgrade(alembic_cfg, "head")
+        await asyncio.to_thread(command.upgrade, alembic_cfg, "head")
 
         # Seed default settings into database
         from settings_util import ensure_defaults
-        ensure_defaults()
+        await asyncio.to_thread(ensure_defaults)
 
         # Load configuration from database (single source of truth)
-        config = load_config_from_db()
+        config = await asyncio.to_thread(load_config_from_db)
         configure_logging(config)
 
         # Initialize services
@@ -69,12 +74,21 @@ async def lifespan(app: FastAPI):
 
         logger.info("Services initialized successfully")
 
-        state = AppState.create_from_config(config)
+        state = await asyncio.to_thread(AppState.create_from_config, config)
         set_app_state(app, state)
 
+        # Open pooled DB connections now rather than on the first requests
+        try:
+            await asyncio.to_thread(warmup_pool)
+        except Exception as e:
+            logger.warning(f"Database pool warmup failed: {e}")
+
         # Start task workers
         logger.info("Starting task workers...")
-        await state.task_service.start_workers()
+        await state.task_service.start_workers(
+            num_workers=config.task.worker_concurrency,
+            batch_size=config.task.worker_batch_size,
+        )
 
         yield
 
@@ -89,10 +103,18 @@ async def lifespan(app: FastAPI):
         except AttributeError:
             state = None
         if state:
-            await state.task_service.stop_workers()
-            state.chat_service.close()
-            state.document_service.close()
-            state.collection_service.close()
+            # Services are independent, so tear them down concurrently
+            names = ("task_service", "chat_service", "document_service", "collection_service")
+            results = await asyncio.gather(
+                state.task_service.stop_workers(),
+                asyncio.to_thread(state.chat_service.close),
+                asyncio.to_thread(state.document_service.close),
+                asyncio.to_thread(state.collection_service.close),
+                return_exceptions=True,
+            )
+            for name, result in zip(names, results):
+                if isinstance(result, BaseException):
+                    logger.error(f"Failed to shut down {name}: {result}", exc_info=result)
 
         logger.info("Services shutdown complete")
 
@@ -102,29 +124,58 @@ app = FastAPI(
     title="AI Document Assistant API",
     description="REST API for document processing and RAG-based questioning",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # Route return values are rendered with orjson instead of the stdlib json module
+    default_response_class=ORJSONResponse,
 )
 
+# Render HTTP/validation errors in the unified format
+register_exception_handlers(app)
+
+API_PREFIX = "/api/v1"
+
+# Streaming endpoints never get wrapped, so the middleware skips them by route
+# instead of sniffing their headers
+NO_UNIFIED_WRAP = {
+    f"{API_PREFIX}/chats/{{chat_id}}/chat/stream",
+    f"{API_PREFIX}/chats/{{chat_id}}/messages/{{message_id}}/regenerate",
+    f"{API_PREFIX}/chats/{{chat_id}}/messages/stream",
+    f"{API_PREFIX}/tasks/{{task_id}}/stream",
+}
+
 # Add unified response middleware (inner)
-app.add_middleware(UnifiedResponseMiddleware)
+app.add_middleware(UnifiedResponseMiddleware, skip_routes=NO_UNIFIED_WRAP)
+
+# Compress outside the envelope so the wrapped body is what gets gzipped. Small
+# bodies are sent as-is; SSE and NDJSON streams and file downloads are never
+# compressed, so streams still flush per event
+app.add_middleware(SelectiveGZipMiddleware, minimum_size=1024, compresslevel=5)
 
 # Add CORS middleware last so it wraps everything and always injects CORS headers
+# ALLOWED_ORIGINS is a comma-separated list; unset keeps the permissive "*" that the
+# Electron shell and local dev rely on
+ALLOWED_ORIGINS = [
+    origin.strip() for origin in (os.getenv("ALLOWED_ORIGINS") or "*").split(",") if origin.strip()
+]
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=ALLOWED_ORIGINS,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=86400,
 )
 
 
 # Include routers with versioned API prefix
-app.include_router(health.router, prefix="/api/v1", tags=["health"])
-app.include_router(collections.router, prefix="/api/v1", tags=["collections"])
-app.include_router(documents.router, prefix="/api/v1", tags=["documents"])
-app.include_router(ingest.router, prefix="/api/v1", tags=["ingest"])
-app.include_router(settings.router, prefix="/api/v1", tags=["settings"])
-app.include_router(tasks.router, prefix="/api/v1", tags=["tasks"])
-app.include_router(chats.router, prefix="/api/v1", tags=["chats"])
-app.include_router(chats_trace.router, prefix="/api/v1", tags=["chats"])
-
-
+ROUTERS = (
+    (health.router, "health"),
+    (collections.router, "collections"),
+    (documents.router, "documents"),
+    (ingest.router, "ingest"),
+    (settings.router, "settings"),
+    (tasks.router, "tasks"),
+    (chats.router, "chats"),
+    (chats_trace.router, "chats"),
+)
+for router, tag in ROUTERS:
+    app.include_router(router, prefix=API_PREFIX, tags=[tag])
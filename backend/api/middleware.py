@@ -2,127 +2,293 @@
 API middleware for unified response handling and error management.
 """
 
-import json
 import logging
+from collections.abc import Iterable, Mapping
+from typing import Any
 
-from fastapi import HTTPException, Request, status
-from fastapi.responses import JSONResponse
+import orjson
+from fastapi import FastAPI, Request, status
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import Response
 from pydantic import ValidationError
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.exceptions import HTTPException as StarletteHTTPException
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from models.api_response import ApiResponse, ResponseCode
 
 logger = logging.getLogger(__name__)
 
+# Envelope bytes around the downstream JSON body. The route output is already valid
+# JSON, so it is spliced in as-is instead of being parsed and re-serialized.
+_SUCCESS_PREFIX = ApiResponse.success().model_dump_json().encode("utf-8")[: -len(b"null}")]
+_SUCCESS_SUFFIX = b"}"
 
-class UnifiedResponseMiddleware(BaseHTTPMiddleware):
+# Sentinel header marking a body that is already in the unified format. It is
+# stripped by the middleware before the response goes out.
+UNIFIED_HEADER = "x-unified"
+_UNIFIED_HEADER_RAW = UNIFIED_HEADER.encode("latin-1")
+
+# Map HTTP status codes to response codes
+_STATUS_TO_CODE: dict[int, ResponseCode] = {
+    400: ResponseCode.INVALID_REQUEST,
+    401: ResponseCode.UNAUTHORIZED,
+    403: ResponseCode.FORBIDDEN,
+    404: ResponseCode.NOT_FOUND,
+    409: ResponseCode.CONFLICT,
+    422: ResponseCode.VALIDATION_ERROR,
+    503: ResponseCode.SERVICE_UNAVAILABLE,
+}
+
+
+def _error_template(code: ResponseCode) -> tuple[bytes, bytes]:
+    """Split an error envelope into the bytes before and after the message value"""
+    raw = ApiResponse.error(code, "").model_dump_json().encode("utf-8")
+    head, tail = raw.split(b'""', 1)
+    return head, tail
+
+
+# Per-code error envelope templates; only the message varies between responses
+_ERROR_TEMPLATES: dict[ResponseCode, tuple[bytes, bytes]] = {
+    code: _error_template(code) for code in ResponseCode
+}
+
+
+def unified_response(data: Any = None, status_code: int = 200) -> Response:
+    """Build an already-wrapped success response that the middleware passes through."""
+    return Response(
+        content=_SUCCESS_PREFIX + orjson.dumps(data) + _SUCCESS_SUFFIX,
+        status_code=status_code,
+        media_type="application/json",
+        headers={UNIFIED_HEADER: "1"},
+    )
+
+
+class UnifiedResponseMiddleware:
     """
-    Middleware to ensure all responses follow the unified format.
+    Pure ASGI middleware to ensure all responses follow the unified format.
 
     This middleware:
     1. Wraps successful responses in the unified format if not already wrapped
-    2. Handles exceptions and converts them to unified error responses
-    3. Adds request/response logging
+    2. Converts unexpected exceptions to unified error responses
+
+    HTTP and validation errors are rendered by the handlers installed with
+    ``register_exception_handlers``.
+
+    It intercepts the ``http.response.start`` / ``http.response.body`` messages
+    directly instead of going through ``BaseHTTPMiddleware``, which spawns an
+    extra task and memory stream for every request.
+
+    Routes listed in ``skip_routes`` (path templates, e.g. SSE endpoints) are
+    passed through without looking at their headers.
     """
 
-    async def dispatch(self, request: Request, call_next):
-        """Process request and response"""
-        try:
-            # Process the request
-            response = await call_next(request)
-            # skip /openapi.json
-            if "/openapi.json" in request.url.path:
-                return response
-
-            # Skip SSE
-            if getattr(response, "media_type", "") == "text/event-stream":
-                return response
-
-            # Skip file download
-            if "attachment" in response.headers.get("content-disposition", ""):
-                return response
-
-            # Skip non json
-            content_type = response.headers.get("content-type", "")
-            if not content_type.startswith("application/json"):
-                return response
-
-            if hasattr(response, "body_iterator"):
-                chunks = []
-                async for chunk in response.body_iterator:
-                    if isinstance(chunk, bytes):
-                        chunks.append(chunk)
-                raw_data = b"".join(chunks).decode("utf-8")
-            else:
-                body = response.body
-                if isinstance(body, memoryview):
-                    body = body.tobytes()
-                raw_data = body.decode("utf-8")
-
-            return JSONResponse(
-                content=ApiResponse.success(data=json.loads(raw_data)).model_dump(),
-                status_code=response.status_code
-            )
+    def __init__(self, app: ASGIApp, skip_routes: Iterable[str] = ()) -> None:
+        self.app = app
+        self.skip_routes = frozenset(skip_routes)
 
-        except HTTPException as e:
-            # Handle HTTP exceptions
-            return self._create_error_response(e.status_code, e.detail)
-
-        except ValidationError as e:
-            # Handle Pydantic validation errors
-            logger.warning(f"Validation error: {e}")
-            return self._create_error_response(
-                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                detail=self._format_validation_error(e),
-                response_code=ResponseCode.VALIDATION_ERROR
-            )
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # skip non-http traffic and /openapi.json
+        if scope["type"] != "http" or "/openapi.json" in scope["path"]:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Message | None = None
+        body: bytearray | None = None
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, body, response_started
+
+            if message["type"] == "http.response.start":
+                # Nothing from an earlier, abandoned start may leak into this response
+                start_message = None
+                body = None
+
+                # The router has stored the matched route in the shared scope by now
+                route = scope.get("route")
+                if route is not None and route.path in self.skip_routes:
+                    # Skipped routes are not wrapped, but an error rendered by the
+                    # exception handlers still carries the internal marker header
+                    message["headers"] = [h for h in message["headers"] if h[0] != _UNIFIED_HEADER_RAW]
+                    response_started = True
+                    await send(message)
+                    return
+
+                # Only plain JSON bodies are wrapped. SSE streams and other non-JSON
+                # content fail the content-type check; file downloads are JSON at
+                # times but must be served untouched.
+                # Single pass over the raw (already lower-cased) header pairs instead of
+                # building a Headers view per response
+                raw_headers = message["headers"]
+                content_type = disposition = content_length = b""
+                unified = False
+                for name, value in raw_headers:
+                    if name == b"content-type":
+                        content_type = value
+                    elif name == b"content-length":
+                        content_length = value
+                    elif name == b"content-disposition":
+                        disposition = value
+                    elif name == _UNIFIED_HEADER_RAW:
+                        unified = True
+
+                if unified:
+                    message["headers"] = [h for h in raw_headers if h[0] != _UNIFIED_HEADER_RAW]
+                    response_started = True
+                    await send(message)
+                    return
+
+                # Bodiless responses (204/304, empty body) have nothing to wrap, and
+                # error responses are already rendered by the exception handlers
+                status_code = message["status"]
+                should_wrap = (
+                    status_code < 400
+                    and content_type[:16] == b"application/json"
+                    and b"attachment" not in disposition
+                    and status_code not in (204, 304)
+                    and content_length != b"0"
+                )
+                if should_wrap:
+                    start_message = message
+                    body = bytearray(_SUCCESS_PREFIX)
+                    return
+                response_started = True
+                await send(message)
+                return
+
+            if body is None or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body += message.get("body", b"")
+            if message.get("more_body", False):
+                return
 
+            body += _SUCCESS_SUFFIX
+            MutableHeaders(scope=start_message)["content-length"] = str(len(body))
+            response_started = True
+            await send(start_message)
+            await send({"type": "http.response.body", "body": bytes(body)})
+
+        try:
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
-            # Handle unexpected exceptions
-            logger.error(f"Unhandled exception: {e}", exc_info=True)
-            return self._create_error_response(
+            # HTTP and validation errors are turned into responses by the exception
+            # handlers below. Only unexpected errors reach this point; they are handled
+            # here rather than by an ``Exception`` handler because Starlette runs that one
+            # in ServerErrorMiddleware, outside CORSMiddleware, and the 500 would then go
+            # out without CORS headers.
+            logger.error("Unhandled exception in %s %s: %s", scope["method"], scope["path"], e, exc_info=True)
+            if response_started:
+                raise
+            # A JSON response may have been half buffered when the error hit;
+            # it is dropped so only the 500 goes out
+            start_message = None
+            body = None
+            response = _create_error_response(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Internal server error",
-
                 response_code=ResponseCode.INTERNAL_ERROR
             )
+            await response(scope, receive, send_wrapper)
+
+
+class _SelectiveGZipResponder(GZipResponder):
+    _passthrough = False
+
+    async def send_with_compression(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self._passthrough = _skip_compression(message["headers"])
+        if self._passthrough:
+            await self.send(message)
+            return
+        await super().send_with_compression(message)
+
+
+def _skip_compression(raw_headers: list[tuple[bytes, bytes]]) -> bool:
+    for name, value in raw_headers:
+        # gzip would buffer NDJSON lines that should reach the client as
+        # they are written
+        if name == b"content-type" and value.startswith(b"application/x-ndjson"):
+            return True
+        # Downloads carry a strong ETag over the exact bytes of the file
+        if name == b"content-disposition" and b"attachment" in value:
+            return True
+    return False
+
+
+class SelectiveGZipMiddleware(GZipMiddleware):
+    """``GZipMiddleware`` that also leaves NDJSON streams and file downloads alone.
+
+    Starlette already skips ``text/event-stream``.
+    """
 
-    def _create_error_response(
-        self,
-        status_code: int,
-        detail: str,
-        response_code: ResponseCode | None = None
-    ) -> JSONResponse:
-        """Create unified error response"""
-
-        # Map HTTP status codes to response codes
-        if response_code is None:
-            mapping = {
-                status.HTTP_404_NOT_FOUND: ResponseCode.NOT_FOUND,
-                status.HTTP_400_BAD_REQUEST: ResponseCode.INVALID_REQUEST,
-                status.HTTP_401_UNAUTHORIZED: ResponseCode.UNAUTHORIZED,
-                status.HTTP_403_FORBIDDEN: ResponseCode.FORBIDDEN,
-                status.HTTP_409_CONFLICT: ResponseCode.CONFLICT,
-                status.HTTP_422_UNPROCESSABLE_ENTITY: ResponseCode.VALIDATION_ERROR,
-                status.HTTP_503_SERVICE_UNAVAILABLE: ResponseCode.SERVICE_UNAVAILABLE,
-            }
-            response_code = mapping.get(status_code, ResponseCode.INTERNAL_ERROR)
-
-        error_response = ApiResponse.error(response_code, detail)
-
-        return JSONResponse(
-            content=error_response.model_dump(),
-            status_code=status_code
-        )
-
-    def _format_validation_error(self, error: ValidationError) -> str:
-        """Format Pydantic validation error for user-friendly message"""
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and "gzip" in Headers(scope=scope).get("accept-encoding", ""):
+            responder = _SelectiveGZipResponder(self.app, self.minimum_size, compresslevel=self.compresslevel)
+            await responder(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+def _create_error_response(
+    status_code: int,
+    detail: Any,
+    response_code: ResponseCode | None = None,
+    headers: Mapping[str, str] | None = None,
+) -> Response:
+    """Create unified error response"""
+
+    if response_code is None:
+        response_code = _STATUS_TO_CODE.get(status_code, ResponseCode.INTERNAL_ERROR)
+
+    head, tail = _ERROR_TEMPLATES[response_code]
+    response = Response(
+        content=head + orjson.dumps(detail, default=str) + tail,
+        status_code=status_code,
+        media_type="application/json",
+        headers=headers,
+    )
+    response.headers[UNIFIED_HEADER] = "1"
+    return response
+
+
+def _format_validation_error(error: ValidationError | RequestValidationError) -> str:
+    """Format Pydantic validation error for user-friendly message"""
+    if isinstance(error, ValidationError):
+        count = error.error_count()
+        if count != 1:
+            return f"Validation failed with {count} errors"
+        err = error.errors(include_url=False, include_context=False, include_input=False)[0]
+    else:
         errors = error.errors()
-        if len(errors) == 1:
-            err = errors[0]
-            field = " -> ".join(str(loc) for loc in err["loc"])
-            return f"Validation error in field '{field}': {err['msg']}"
-        else:
+        if len(errors) != 1:
             return f"Validation failed with {len(errors)} errors"
+        err = errors[0]
+
+    field = " -> ".join(map(str, err["loc"]))
+    return f"Validation error in field '{field}': {err['msg']}"
+
+
+async def _http_exception_handler(request: Request, exc: StarletteHTTPException) -> Response:
+    return _create_error_response(exc.status_code, exc.detail, headers=exc.headers)
+
+
+async def _validation_exception_handler(
+    request: Request, exc: ValidationError | RequestValidationError
+) -> Response:
+    logger.warning("Validation error: %s", exc)
+    return _create_error_response(
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        detail=_format_validation_error(exc),
+        response_code=ResponseCode.VALIDATION_ERROR
+    )
 
 
+def register_exception_handlers(app: FastAPI) -> None:
+    """Render HTTP and validation errors in the unified format."""
+    app.add_exception_handler(StarletteHTTPException, _http_exception_handler)
+    app.add_exception_handler(RequestValidationError, _validation_exception_handler)
+    app.add_exception_handler(ValidationError, _validation_exception_handler)
@@ -0,0 +1,27 @@
+"""
+Opaque keyset cursors for list endpoints.
+"""
+
+import base64
+import binascii
+
+import orjson
+
+from exception import HTTPBadRequestException
+
+
+def encode_cursor(*keys) -> str:
+    """Pack the sort keys of the last row on a page into a URL-safe token"""
+    return base64.urlsafe_b64encode(orjson.dumps(list(keys))).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    """Unpack a cursor made by :func:`encode_cursor` with *size* keys"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        keys = orjson.loads(raw)
+    except (binascii.Error, ValueError):
+        raise HTTPBadRequestException("Invalid cursor") from None
+    if not isinstance(keys, list) or len(keys) != size:
+        raise HTTPBadRequestException("Invalid cursor")
+    return keys
@@ -3,17 +3,20 @@ Chat management and conversation routes.
 """
 
 import asyncio
-import json
 import logging
 
-from fastapi import APIRouter, Request, status
-from sse_starlette.sse import EventSourceResponse
+import orjson
+from fastapi import APIRouter, Depends, Request, status
+from fastapi.responses import Response, StreamingResponse
+from pydantic import TypeAdapter
 
-from api.state import get_app_state
-from chat.agent_service import get_cancel_token
+from api.pagination import decode_cursor, encode_cursor
+from api.sse import sse_frame, sse_response
+from api.state import get_agent_chat_service, get_chat_service, get_collection_service
+from chat.agent.streaming import coalesce_thinking
+from chat.agent_service import AgentChatService, get_cancel_token
 from exception import (
     HTTPBadRequestException,
-    HTTPInternalServerErrorException,
     HTTPNotFoundException,
 )
 from models.requests import (
@@ -22,24 +25,41 @@ from models.requests import (
     ReorderChatsRequest,
     UpdateChatRequest,
 )
+from models.responses import ChatMessageResponse, ChatResponse
+from services.chat_service import ChatService
+from services.collection_service import CollectionService
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Compiled once; serializes a whole page to JSON bytes in one Rust call instead of
+# model_dump() per item
+_CHATS_ADAPTER = TypeAdapter(list[ChatResponse])
+_MESSAGES_ADAPTER = TypeAdapter(list[ChatMessageResponse])
+_MESSAGE_ADAPTER = TypeAdapter(ChatMessageResponse)
+
+
+async def _require_collections(collection_service: CollectionService, collection_ids: list[str]) -> None:
+    """Raise 400 if any of the collections does not exist (one query for all IDs)."""
+    ids = list(dict.fromkeys(collection_ids))
+    existing = await collection_service.get_existing_collection_ids(ids)
+    missing = [cid for cid in ids if cid not in existing]
+    if missing:
+        names = "', '".join(missing)
+        raise HTTPBadRequestException(f"Collection '{names}' not found")
+
 
 @router.post("/chats", status_code=status.HTTP_201_CREATED)
-async def create_chat(request_data: CreateChatRequest, request: Request):
+async def create_chat(
+    request_data: CreateChatRequest,
+    chat_service: ChatService = Depends(get_chat_service),
+    collection_service: CollectionService = Depends(get_collection_service),
+):
     """
     Create a new chat conversation
     """
-    chat_service = get_app_state(request).chat_service
-    collection_service = get_app_state(request).collection_service
-
     # Validate collections exist
-    for collection_id in request_data.collection_ids:
-        collection = await collection_service.get_collection(collection_id)
-        if not collection:
-            raise HTTPBadRequestException(f"Collection '{collection_id}' not found")
+    await _require_collections(collection_service, request_data.collection_ids)
 
     # Create chat
     chat = await chat_service.create_chat(
@@ -48,66 +68,82 @@ async def create_chat(request_data: CreateChatRequest, request: Request):
         bound_collection_id=request_data.bound_collection_id
     )
 
-    logger.info(f"Created chat {chat.chat_id} with name '{chat.name}'")
+    logger.info("Created chat %s with name '%s'", chat.chat_id, chat.name)
 
     return chat
 
 
 @router.get("/chats")
 async def list_chats(
-    request: Request,
     offset: int = 0,
-    limit: int = 50
+    limit: int = 50,
+    cursor: str | None = None,
+    include_total: bool | None = None,
+    chat_service: ChatService = Depends(get_chat_service),
 ):
     """
     List chat conversations
-    """
-    chat_service = get_app_state(request).chat_service
-
-    chats = await chat_service.list_chats(offset=offset, limit=limit)
 
-    return {
-        "chats": [chat.model_dump() for chat in chats],
+    Pass the returned ``next_cursor`` back as ``cursor`` to page by keyset
+    instead of offset. ``total`` costs an extra COUNT, so it is only computed
+    for offset paging unless ``include_total`` says otherwise; keyset pages
+    return ``total: null`` by default.
+    """
+    after = None
+    if cursor:
+        sort_order, chat_id = decode_cursor(cursor, 2)
+        if not isinstance(sort_order, int) or not isinstance(chat_id, str):
+            raise HTTPBadRequestException("Invalid cursor")
+        after = (sort_order, chat_id)
+    if include_total is None:
+        include_total = after is None
+
+    if after is None and include_total:
+        chats, total = await chat_service.list_chats_page(offset=offset, limit=limit)
+    else:
+        chats = await chat_service.list_chats(offset=offset, limit=limit, after=after)
+        # A window count over a keyset page would only see rows past the cursor
+        total = await chat_service.count_chats() if include_total else None
+    next_cursor = None
+    if limit and len(chats) == limit:
+        next_cursor = encode_cursor(chats[-1].sort_order, chats[-1].chat_id)
+
+    # The page is already JSON; orjson splices it in without re-encoding
+    return Response(orjson.dumps({
+        "chats": orjson.Fragment(_CHATS_ADAPTER.dump_json(chats)),
         "offset": offset,
         "limit": limit,
-        "total": len(chats)  # Could implement proper count if needed
-    }
+        "total": total,
+        "next_cursor": next_cursor
+    }), media_type="application/json")
 
 
-@router.get("/chats/{chat_id}")
-async def get_chat(chat_id: str, request: Request):
+@router.get("/chats/{chat_id}", responses={200: {"model": ChatResponse}})
+async def get_chat(chat_id: str, chat_service: ChatService = Depends(get_chat_service)):
     """
     Get chat information
     """
-    chat_service = get_app_state(request).chat_service
-
     chat = await chat_service.get_chat(chat_id)
 
     if not chat:
         raise HTTPNotFoundException(f"Chat '{chat_id}' not found")
 
-    return chat
+    return Response(chat.model_dump_json(), media_type="application/json")
 
 
 @router.patch("/chats/{chat_id}")
 async def update_chat(
     chat_id: str,
     request_data: UpdateChatRequest,
-    request: Request
+    chat_service: ChatService = Depends(get_chat_service),
+    collection_service: CollectionService = Depends(get_collection_service),
 ):
     """
     Update chat information
     """
-    app_state = get_app_state(request)
-    chat_service = app_state.chat_service
-    collection_service = app_state.collection_service
-
     # Validate collections exist if provided
     if request_data.collection_ids:
-        for collection_id in request_data.collection_ids:
-            collection = await collection_service.get_collection(collection_id)
-            if not collection:
-                raise HTTPBadRequestException(f"Collection '{collection_id}' not found")
+        await _require_collections(collection_service, request_data.collection_ids)
 
     # Update chat
     chat = await chat_service.update_chat(
@@ -119,24 +155,22 @@ async def update_chat(
     if not chat:
         raise HTTPNotFoundException(f"Chat '{chat_id}' not found")
 
-    logger.info(f"Updated chat {chat_id}")
+    logger.info("Updated chat %s", chat_id)
 
     return chat
 
 
 @router.delete("/chats/{chat_id}")
-async def delete_chat(chat_id: str, request: Request):
+async def delete_chat(chat_id: str, chat_service: ChatService = Depends(get_chat_service)):
     """
     Delete a chat conversation
     """
-    chat_service = get_app_state(request).chat_service
-
     success = await chat_service.delete_chat(chat_id)
 
     if not success:
         raise HTTPNotFoundException(f"Chat '{chat_id}' not found")
 
-    logger.info(f"Deleted chat {chat_id}")
+    logger.info("Deleted chat %s", chat_id)
 
     return {
         "chat_id": chat_id,
@@ -145,37 +179,37 @@ async def delete_chat(chat_id: str, request: Request):
 
 
 @router.post("/chats/reorder")
-async def reorder_chats(request_data: ReorderChatsRequest, request: Request):
+async def reorder_chats(
+    request_data: ReorderChatsRequest,
+    chat_service: ChatService = Depends(get_chat_service),
+):
     """
     Reorder chats by rewriting sort_order based on the provided full id list.
 
     Strict mode: the list must contain exactly all existing chat ids,
     in the desired new display order.
     """
-    chat_service = get_app_state(request).chat_service
-
     try:
         count = await chat_service.reorder_chats(request_data.chat_ids)
     except ValueError as e:
         raise HTTPBadRequestException(str(e)) from e
 
-    logger.info(f"Reordered {count} chats")
+    logger.info("Reordered %d chats", count)
 
     return {"reordered": count}
 
 
 @router.delete("/chats/{chat_id}/messages")
-async def clear_chat_messages(chat_id: str, request: Request):
+async def clear_chat_messages(chat_id: str, chat_service: ChatService = Depends(get_chat_service)):
     """
     Delete all messages in a chat (keeps the chat itself).
     """
-    chat_service = get_app_state(request).chat_service
     deleted = await chat_service.clear_chat_messages(chat_id)
 
     if deleted < 0:
         raise HTTPNotFoundException(f"Chat '{chat_id}' not found")
 
-    logger.info(f"Cleared {deleted} messages from chat {chat_id}")
+    logger.info("Cleared %d messages from chat %s", deleted, chat_id)
 
     return {
         "chat_id": chat_id,
@@ -186,50 +220,66 @@ async def clear_chat_messages(chat_id: str, request: Request):
 @router.get("/chats/{chat_id}/messages")
 async def get_chat_messages(
     chat_id: str,
-    request: Request,
     offset: int = 0,
-    limit: int = 50
+    limit: int = 50,
+    chat_service: ChatService = Depends(get_chat_service),
 ):
     """
     Get messages for a chat
     """
-    chat_service = get_app_state(request).chat_service
-
     # Verify chat exists
-    chat = await chat_service.get_chat(chat_id)
-    if not chat:
+    if not await chat_service.chat_exists(chat_id):
         raise HTTPNotFoundException(f"Chat '{chat_id}' not found")
 
-    messages = await chat_service.get_chat_messages(
+    messages, total = await chat_service.get_chat_messages_page(
         chat_id=chat_id,
         offset=offset,
         limit=limit
     )
-    total = await chat_service.count_chat_messages(chat_id)
 
-    return {
-        "messages": [message.model_dump() for message in messages],
+    return Response(orjson.dumps({
+        "messages": orjson.Fragment(_MESSAGES_ADAPTER.dump_json(messages)),
         "offset": offset,
         "limit": limit,
         "total": total
-    }
+    }), media_type="application/json")
+
+
+@router.get("/chats/{chat_id}/messages/stream")
+async def stream_chat_messages(
+    chat_id: str,
+    offset: int = 0,
+    limit: int | None = None,
+    chat_service: ChatService = Depends(get_chat_service),
+):
+    """
+    Stream messages for a chat as NDJSON, one message per line
+
+    Rows are read from a server-side cursor and written as they arrive, so
+    memory stays flat however long the chat is.
+    """
+    # Verify chat exists
+    if not await chat_service.chat_exists(chat_id):
+        raise HTTPNotFoundException(f"Chat '{chat_id}' not found")
+
+    # Sync generator: StreamingResponse pulls it in the thread pool
+    def lines():
+        for message in chat_service.iter_chat_messages(chat_id, offset=offset, limit=limit):
+            yield _MESSAGE_ADAPTER.dump_json(message) + b"\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
 
 
 @router.post("/chats/{chat_id}/chat/stream")
 async def send_message_stream(
     chat_id: str,
     request_data: ChatMessageRequest,
-    request: Request
+    request: Request,
+    agent_service: AgentChatService = Depends(get_agent_chat_service),
 ):
     """
     Send a message and get AI response (streaming via SSE)
     """
-    app_state = get_app_state(request)
-    agent_service = app_state.agent_chat_service
-
-    if agent_service is None:
-        raise HTTPInternalServerErrorException("Agent chat service not initialized")
-
     async def event_generator():
         message_id: str | None = None
 
@@ -247,17 +297,22 @@ async def send_message_stream(
         watcher_task = asyncio.create_task(disconnect_watcher())
 
         try:
-            async for event in agent_service.process(
+            events = agent_service.process(
                 chat_id=chat_id,
                 query=request_data.message,
                 document_ids=request_data.document_ids,
+            )
+            async for event in coalesce_thinking(
+                events,
+                max_chars=agent_service.config.stream_flush_chars,
+                max_delay=agent_service.config.stream_flush_interval,
             ):
                 if event.type.value == "agent_start" and message_id is None:
                     message_id = event.data.get("message_id")
-                yield {
-                    "event": event.type.value,
-                    "data": json.dumps(event.data),
-                }
+                yield sse_frame(
+                    event.type.value,
+                    orjson.dumps(event.data, option=orjson.OPT_NON_STR_KEYS),
+                )
         finally:
             watcher_task.cancel()
             try:
@@ -265,30 +320,24 @@ async def send_message_stream(
             except asyncio.CancelledError:
                 pass
 
-    return EventSourceResponse(event_generator())
+    return sse_response(event_generator())
 
 
 @router.post("/chats/{chat_id}/messages/{message_id}/regenerate")
 async def regenerate_message(
     chat_id: str,
     message_id: str,
-    request: Request
+    request: Request,
+    agent_service: AgentChatService = Depends(get_agent_chat_service),
+    chat_service: ChatService = Depends(get_chat_service),
 ):
     """
     Regenerate an AI response: delete the assistant message, find the
     preceding user message, and re-run the agent with the same query.
     Returns the same SSE stream as send_message_stream.
     """
-    app_state = get_app_state(request)
-    agent_service = app_state.agent_chat_service
-    chat_service = app_state.chat_service
-
-    if agent_service is None:
-        raise HTTPInternalServerErrorException("Agent chat service not initialized")
-
     # Verify chat exists
-    chat = await chat_service.get_chat(chat_id)
-    if not chat:
+    if not await chat_service.chat_exists(chat_id):
         raise HTTPNotFoundException(f"Chat '{chat_id}' not found")
 
     # Find the assistant message to regenerate
@@ -333,16 +382,18 @@ async def regenerate_message(
         watcher_task = asyncio.create_task(disconnect_watcher())
 
         try:
-            async for event in agent_service.process(
-                chat_id=chat_id,
-                query=user_query,
+            events = agent_service.process(chat_id=chat_id, query=user_query)
+            async for event in coalesce_thinking(
+                events,
+                max_chars=agent_service.config.stream_flush_chars,
+                max_delay=agent_service.config.stream_flush_interval,
             ):
                 if event.type.value == "agent_start" and stream_msg_id is None:
                     stream_msg_id = event.data.get("message_id")
-                yield {
-                    "event": event.type.value,
-                    "data": json.dumps(event.data),
-                }
+                yield sse_frame(
+                    event.type.value,
+                    orjson.dumps(event.data, option=orjson.OPT_NON_STR_KEYS),
+                )
         finally:
             watcher_task.cancel()
             try:
@@ -350,4 +401,4 @@ async def regenerate_message(
             except asyncio.CancelledError:
                 pass
 
-    return EventSourceResponse(event_generator())
+    return sse_response(event_generator())
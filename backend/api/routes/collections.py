@@ -5,25 +5,38 @@ Collection management routes.
 import logging
 from typing import Optional
 
-from fastapi import APIRouter, Request, status
+import orjson
+from fastapi import APIRouter, BackgroundTasks, Depends, Request, Response, status
+from pydantic import BaseModel
 
-from api.state import get_app_state
+from api.etag import compute_etag, json_etag_response
+from api.state import get_collection_service, get_task_service
 from exception import HTTPBadRequestException, HTTPConflictException, HTTPNotFoundException
 from models.requests import (
     CreateCollectionRequest,
     RecategorizeRequest,
     UpdateCollectionRequest,
 )
-from models.responses import ListCollectionsResponseV1, ReadmeResponse
+from models.responses import CollectionResponse, ListCollectionsResponseV1, ReadmeResponse
+from services.collection_service import CollectionService
+from services.task_service import TaskService
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+def _cached_body(collection_service: CollectionService, key: tuple, generation: int, payload: BaseModel) -> tuple[bytes, str]:
+    """Serialize *payload* and cache its body and ETag under *key*"""
+    body = orjson.dumps(payload.model_dump(mode="json"))
+    entry = (body, compute_etag(body))
+    collection_service.cache_response(key, entry, generation)
+    return entry
+
+
 @router.post("/collections", status_code=status.HTTP_201_CREATED)
 async def create_collection(
     request_data: CreateCollectionRequest,
-    request: Request
+    collection_service: CollectionService = Depends(get_collection_service),
 ):
     """
     Create a new collection
@@ -31,10 +44,6 @@ async def create_collection(
     Args:
         request_data: Collection creation data
     """
-    app_state = get_app_state(request)
-
-    collection_service = app_state.collection_service
-
     collection = await collection_service.create_collection(
         collection_id=request_data.id,
         name=request_data.name,
@@ -47,54 +56,57 @@ async def create_collection(
     return collection
 
 
-@router.get("/collections")
-async def list_collections(request: Request, search: Optional[str] = None):
+@router.get("/collections", responses={200: {"model": ListCollectionsResponseV1}})
+async def list_collections(
+    request: Request,
+    search: Optional[str] = None,
+    collection_service: CollectionService = Depends(get_collection_service),
+):
     """
     List all available collections
 
     Args:
         search: Optional search keyword to filter collections
     """
-    app_state = get_app_state(request)
-
-    collection_service = app_state.collection_service
-
-    collections = await collection_service.list_collections(search=search)
-
-    response_data = ListCollectionsResponseV1(
-        collections=collections,
-        total=len(collections)
-    )
+    key = ("list", search)
+    entry, generation = collection_service.get_cached_response(key)
+    if entry is None:
+        collections = await collection_service.list_collections(search=search)
+        entry = _cached_body(collection_service, key, generation, ListCollectionsResponseV1(
+            collections=collections,
+            total=len(collections)
+        ))
 
-    return response_data
+    return json_etag_response(request, *entry)
 
 
-@router.get("/collections/{collection_id}")
-async def get_collection(collection_id: str, request: Request):
+@router.get("/collections/{collection_id}", responses={200: {"model": CollectionResponse}})
+async def get_collection(
+    collection_id: str,
+    request: Request,
+    collection_service: CollectionService = Depends(get_collection_service),
+):
     """Get information about a specific collection"""
-    app_state = get_app_state(request)
+    key = ("get", collection_id)
+    entry, generation = collection_service.get_cached_response(key)
+    if entry is None:
+        collection = await collection_service.get_collection(collection_id)
 
-    collection_service = app_state.collection_service
-
-    collection = await collection_service.get_collection(collection_id)
+        if not collection:
+            raise HTTPNotFoundException(f"Collection '{collection_id}' not found")
 
-    if not collection:
-        raise HTTPNotFoundException(f"Collection '{collection_id}' not found")
+        entry = _cached_body(collection_service, key, generation, collection)
 
-    return collection
+    return json_etag_response(request, *entry)
 
 
 @router.patch("/collections/{collection_id}")
 async def update_collection(
     collection_id: str,
     request_data: UpdateCollectionRequest,
-    request: Request
+    collection_service: CollectionService = Depends(get_collection_service),
 ):
     """Update a collection"""
-    app_state = get_app_state(request)
-
-    collection_service = app_state.collection_service
-
     # Validate at least one field is provided
     if request_data.name is None and request_data.description is None:
         raise HTTPBadRequestException("At least one field (name or description) must be provided")
@@ -112,57 +124,61 @@ async def update_collection(
 
 
 @router.delete("/collections/{collection_id}")
-async def delete_collection(collection_id: str, request: Request):
+async def delete_collection(
+    collection_id: str,
+    background_tasks: BackgroundTasks,
+    collection_service: CollectionService = Depends(get_collection_service),
+):
     """Delete a collection"""
-    app_state = get_app_state(request)
-
-    collection_service = app_state.collection_service
+    domains = await collection_service.delete_collection(collection_id)
 
-    await collection_service.delete_collection(collection_id)
+    # Removing the crawl cache can take a while; do it after the response is sent
+    background_tasks.add_task(collection_service.remove_crawl_cache, domains)
 
     return {}
 
 
 @router.post("/collections/{collection_id}/clear")
-async def clear_collection_data(collection_id: str, request: Request):
+async def clear_collection_data(
+    collection_id: str,
+    background_tasks: BackgroundTasks,
+    collection_service: CollectionService = Depends(get_collection_service),
+):
     """Clear all data in a collection but keep the collection itself"""
-    app_state = get_app_state(request)
-    collection_service = app_state.collection_service
-
     collection = await collection_service.get_collection(collection_id)
     if not collection:
         raise HTTPNotFoundException(f"Collection '{collection_id}' not found")
 
-    await collection_service.clear_collection(collection_id)
+    domains = await collection_service.clear_collection(collection_id)
+    background_tasks.add_task(collection_service.remove_crawl_cache, domains)
     return {}
 
 
-@router.get("/collections/{collection_id}/readme")
-async def get_collection_readme(collection_id: str, request: Request):
+@router.get("/collections/{collection_id}/readme", responses={200: {"model": ReadmeResponse}})
+async def get_collection_readme(collection_id: str, collection_service: CollectionService = Depends(get_collection_service)):
     """Get the AI-generated README and categories for a collection"""
-    collection_service = get_app_state(request).collection_service
-
     readme_content, categories_json, readme_content_zh, categories_json_zh, source_language = await collection_service.get_readme(collection_id)
     if readme_content is None:
         raise HTTPNotFoundException(f"Collection '{collection_id}' not found")
 
-    return ReadmeResponse(
+    return Response(ReadmeResponse(
         readme_content=readme_content,
         categories_json=categories_json,
         readme_content_zh=readme_content_zh,
         categories_json_zh=categories_json_zh,
         source_language=source_language,
-    )
+    ).model_dump_json(), media_type="application/json")
 
 
 @router.post("/collections/{collection_id}/reindex", status_code=status.HTTP_202_ACCEPTED)
-async def reindex_collection(collection_id: str, request: Request):
+async def reindex_collection(
+    collection_id: str,
+    collection_service: CollectionService = Depends(get_collection_service),
+    task_service: TaskService = Depends(get_task_service),
+):
     """Trigger re-indexing of all documents in a collection with current chunking parameters."""
-    app_state = get_app_state(request)
-    task_service = app_state.task_service
-
     # Verify collection exists and has documents
-    collection = await app_state.collection_service.get_collection(collection_id)
+    collection = await collection_service.get_collection(collection_id)
     if not collection:
         raise HTTPNotFoundException(f"Collection '{collection_id}' not found")
     if collection.document_count == 0:
@@ -174,19 +190,20 @@ async def reindex_collection(collection_id: str, request: Request):
         input_params={},
     )
 
-    logger.info(f"Created reindex task {task.task_id} for collection {collection_id}")
+    logger.info("Created reindex task %s for collection %s", task.task_id, collection_id)
 
     return {"task_id": task.task_id, "status": task.status}
 
 
 @router.post("/collections/{collection_id}/regenerate-readme", status_code=status.HTTP_202_ACCEPTED)
-async def regenerate_readme(collection_id: str, request: Request):
+async def regenerate_readme(
+    collection_id: str,
+    collection_service: CollectionService = Depends(get_collection_service),
+    task_service: TaskService = Depends(get_task_service),
+):
     """Re-categorize all documents and regenerate README without re-crawling."""
-    app_state = get_app_state(request)
-    task_service = app_state.task_service
-
     # Verify collection exists and has documents
-    collection = await app_state.collection_service.get_collection(collection_id)
+    collection = await collection_service.get_collection(collection_id)
     if not collection:
         raise HTTPNotFoundException(f"Collection '{collection_id}' not found")
     if collection.document_count == 0:
@@ -198,7 +215,7 @@ async def regenerate_readme(collection_id: str, request: Request):
         input_params={"title": "重新生成 README"},
     )
 
-    logger.info(f"Created regenerate_readme task {task.task_id} for collection {collection_id}")
+    logger.info("Created regenerate_readme task %s for collection %s", task.task_id, collection_id)
 
     return {"task_id": task.task_id, "status": task.status}
 
@@ -207,14 +224,12 @@ async def regenerate_readme(collection_id: str, request: Request):
 async def recategorize_collection(
     collection_id: str,
     request_data: RecategorizeRequest,
-    request: Request,
+    collection_service: CollectionService = Depends(get_collection_service),
+    task_service: TaskService = Depends(get_task_service),
 ):
     """Re-categorize all documents in a collection without re-crawling."""
-    app_state = get_app_state(request)
-    task_service = app_state.task_service
-
     # Verify collection exists and has documents
-    collection = await app_state.collection_service.get_collection(collection_id)
+    collection = await collection_service.get_collection(collection_id)
     if not collection:
         raise HTTPNotFoundException(f"Collection '{collection_id}' not found")
     if collection.document_count == 0:
@@ -229,6 +244,6 @@ async def recategorize_collection(
         },
     )
 
-    logger.info(f"Created recategorize task {task.task_id} for collection {collection_id}")
+    logger.info("Created recategorize task %s for collection %s", task.task_id, collection_id)
 
     return {"task_id": task.task_id, "status": task.status}
@@ -3,73 +3,95 @@ Document management routes.
 """
 
 import logging
+from datetime import datetime
 from typing import Optional
 
-from fastapi import APIRouter, Query, Request
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import Response
 
-from api.state import get_app_state
-from exception import HTTPNotFoundException
+from api.etag import compute_etag, etag_matches
+from api.pagination import decode_cursor, encode_cursor
+from api.state import get_document_service
+from exception import HTTPBadRequestException, HTTPNotFoundException
+from models.responses import DocumentResponse, ListDocumentsResponse
+from services.document_service import DocumentService
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
-@router.get("/collections/{collection_id}/documents")
+@router.get("/collections/{collection_id}/documents", responses={200: {"model": ListDocumentsResponse}})
 async def list_documents(
     collection_id: str,
-    request: Request,
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(50, ge=1, le=200, description="Page size"),
     search: Optional[str] = Query(None, description="Search term for document names"),
-    status: Optional[str] = Query(None, description="Filter by document status")
+    status: Optional[str] = Query(None, description="Filter by document status"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from a previous page's next_cursor"),
+    include_total: Optional[bool] = Query(None, description="Compute total (default: only without cursor)"),
+    document_service: DocumentService = Depends(get_document_service),
 ):
     """
     List documents in a collection with pagination and filters
 
     Args:
         collection_id: Collection ID
-        page: Page number (starts from 1)
+        page: Page number (starts from 1), ignored when cursor is given
         page_size: Number of documents per page
         search: Optional search term for document names
         status: Optional status filter (pending, processing, indexed, failed)
+        cursor: Keyset cursor; reads the page after it without an OFFSET scan
+        include_total: Whether to run the COUNT query for total
     """
-    document_service = get_app_state(request).document_service
-
-    return await document_service.list_documents(
+    after = None
+    if cursor:
+        updated_at, document_id = decode_cursor(cursor, 2)
+        try:
+            after = (datetime.fromisoformat(updated_at), document_id)
+        except (TypeError, ValueError):
+            raise HTTPBadRequestException("Invalid cursor") from None
+    if include_total is None:
+        include_total = after is None
+
+    result = await document_service.list_documents(
         collection_id=collection_id,
         page=page,
         page_size=page_size,
         search=search,
-        status=status
+        status=status,
+        after=after,
+        include_total=include_total
     )
+    if len(result.documents) == page_size and result.documents[-1].updated_at:
+        last = result.documents[-1]
+        result.next_cursor = encode_cursor(last.updated_at, last.id)
+
+    # Serialize straight to JSON bytes, skipping FastAPI's jsonable_encoder pass
+    return Response(result.model_dump_json(), media_type="application/json")
 
 
-@router.get("/collections/{collection_id}/documents/{document_id}")
+@router.get("/collections/{collection_id}/documents/{document_id}", responses={200: {"model": DocumentResponse}})
 async def get_document(
     collection_id: str,
     document_id: str,
-    request: Request
+    document_service: DocumentService = Depends(get_document_service),
 ):
     """Get a specific document"""
-    document_service = get_app_state(request).document_service
-
     document = await document_service.get_document(collection_id, document_id)
 
     if not document:
         raise HTTPNotFoundException(f"Document '{document_id}' not found in collection '{collection_id}'")
 
-    return document
+    return Response(document.model_dump_json(), media_type="application/json")
 
 
 @router.delete("/collections/{collection_id}/documents/{document_id}")
 async def delete_document(
     collection_id: str,
     document_id: str,
-    request: Request
+    document_service: DocumentService = Depends(get_document_service),
 ):
     """Delete a document and its associated chunks/vectors"""
-    document_service = get_app_state(request).document_service
-
     success = await document_service.delete_document(collection_id, document_id)
 
     if not success:
@@ -85,18 +107,25 @@ async def delete_document(
 async def download_document(
     collection_id: str,
     document_id: str,
-    request: Request
+    request: Request,
+    document_service: DocumentService = Depends(get_document_service),
 ):
     """
     Download a document file (only for local files)
     """
-    document_service = get_app_state(request).document_service
-
     file_response = await document_service.download_document(collection_id, document_id)
 
     if not file_response:
         raise HTTPNotFoundException(f"Document '{document_id}' not found in collection '{collection_id}'")
 
+    # The body is built from the stored content, so a repeat download can be
+    # answered with a bare 304
+    etag = compute_etag(file_response.body)
+    cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=cache_headers)
+
+    file_response.headers.update(cache_headers)
     return file_response
 
 
@@ -104,11 +133,9 @@ async def download_document(
 async def get_document_content(
     collection_id: str,
     document_id: str,
-    request: Request
+    document_service: DocumentService = Depends(get_document_service),
 ):
     """Get a document's markdown content"""
-    document_service = get_app_state(request).document_service
-
     content = await document_service.get_document_content(collection_id, document_id)
 
     if content is None:
@@ -2,14 +2,19 @@
 Health check routes.
 """
 
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Response
+
+from api.middleware import UNIFIED_HEADER, unified_response
 
 router = APIRouter()
 
+# The payload never changes, so it is encoded once; health probes only copy bytes
+_HEALTH_BODY = unified_response({
+    "status": "ok",
+    "version": "0.1.0",
+}).body
+
 
 @router.get("/health")
-async def health_check(request: Request):
-    return {
-        "status": "ok",
-        "version": "0.1.0",
-    }
+async def health_check():
+    return Response(_HEALTH_BODY, media_type="application/json", headers={UNIFIED_HEADER: "1"})
@@ -4,11 +4,11 @@ Data ingestion routes for files and URLs.
 
 import logging
 
-from fastapi import APIRouter, Request, status
+from fastapi import APIRouter, Depends, status
 
-from api.state import get_app_state
-from exception import HTTPBadRequestException, HTTPNotFoundException
+from api.state import get_task_service, require_collection
 from models.requests import IngestFilesRequest, IngestUrlsRequest
+from services.task_service import TaskService
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -16,25 +16,13 @@ router = APIRouter()
 
 @router.post("/collections/{collection_id}/ingest/files", status_code=status.HTTP_202_ACCEPTED)
 async def ingest_files(
-    collection_id: str,
     request_data: IngestFilesRequest,
-    request: Request
+    collection_id: str = Depends(require_collection),
+    task_service: TaskService = Depends(get_task_service),
 ):
     """
     Ingest local files into a collection
     """
-    # Validate collection exists
-    collection_service = get_app_state(request).collection_service
-    task_service = get_app_state(request).task_service
-
-    collection = await collection_service.get_collection(collection_id)
-    if not collection:
-        raise HTTPNotFoundException(f"Collection '{collection_id}' not found")
-
-    # Validate files list
-    if not request_data.files:
-        raise HTTPBadRequestException("Files list cannot be empty")
-
     # Create task
     task = await task_service.create_task(
         task_type="ingest_files",
@@ -52,25 +40,13 @@ async def ingest_files(
 
 @router.post("/collections/{collection_id}/ingest/urls", status_code=status.HTTP_202_ACCEPTED)
 async def ingest_urls(
-    collection_id: str,
     request_data: IngestUrlsRequest,
-    request: Request
+    collection_id: str = Depends(require_collection),
+    task_service: TaskService = Depends(get_task_service),
 ):
     """
     Ingest URLs into a collection
     """
-    # Validate collection exists
-    collection_service = get_app_state(request).collection_service
-    task_service = get_app_state(request).task_service
-
-    collection = await collection_service.get_collection(collection_id)
-    if not collection:
-        raise HTTPNotFoundException(f"Collection '{collection_id}' not found")
-
-    # Validate URLs list
-    if not request_data.url_configs:
-        raise HTTPBadRequestException("URLs list cannot be empty")
-
     # Create task — serialize url_configs for multi-prefix support
     first_config = request_data.url_configs[0]
     task = await task_service.create_task(
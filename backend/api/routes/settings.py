@@ -7,7 +7,7 @@ Supports both legacy TOML-based configuration and the new DB-backed settings.
 import logging
 from typing import Any, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
 
 from api.state import AppState
@@ -18,6 +18,7 @@ from settings_util import (
     is_config_complete,
     list_settings,
     set_setting,
+    set_settings,
 )
 
 logger = logging.getLogger(__name__)
@@ -37,14 +38,14 @@ async def get_settings() -> dict[str, Any]:
 
 
 @router.put("/")
-async def update_settings(settings_data: dict[str, Any]) -> dict[str, Any]:
+async def update_settings(request: Request, settings_data: dict[str, Any]) -> dict[str, Any]:
     """Update application settings with new values."""
     try:
         new_config = AppConfig.from_dict(settings_data)
         new_config.validate()
         update_config(new_config)
 
-        AppState.recreate_with_new_config(new_config)
+        AppState.recreate_with_new_config(request.app, new_config)
 
         logger.info("Settings updated successfully")
 
@@ -106,7 +107,7 @@ async def get_setting_item(key: str) -> dict[str, Any]:
 
 
 @router.put("/items")
-async def upsert_setting_item(item: SettingItem) -> dict[str, Any]:
+async def upsert_setting_item(request: Request, item: SettingItem) -> dict[str, Any]:
     """Create or update a single setting."""
     set_setting(
         item.key,
@@ -120,7 +121,7 @@ async def upsert_setting_item(item: SettingItem) -> dict[str, Any]:
     # Reload services with new config
     try:
         new_config = load_config_from_db()
-        AppState.recreate_with_new_config(new_config)
+        AppState.recreate_with_new_config(request.app, new_config)
     except Exception as e:
         logger.warning(f"Failed to reload config after setting change: {e}")
 
@@ -132,22 +133,24 @@ class SettingsBatch(BaseModel):
 
 
 @router.put("/items/batch")
-async def upsert_settings_batch(batch: SettingsBatch) -> dict[str, Any]:
+async def upsert_settings_batch(request: Request, batch: SettingsBatch) -> dict[str, Any]:
     """Batch update multiple settings at once (used by setup wizard)."""
-    for item in batch.items:
-        set_setting(
-            item.key,
-            item.value,
-            category=item.category or "general",
-            value_type=item.value_type or "string",
-            description=item.description or "",
-            is_sensitive=item.is_sensitive or False,
-        )
+    set_settings(
+        {
+            "key": item.key,
+            "value": item.value,
+            "category": item.category or "general",
+            "value_type": item.value_type or "string",
+            "description": item.description or "",
+            "is_sensitive": item.is_sensitive or False,
+        }
+        for item in batch.items
+    )
 
     # Reload services with new config
     try:
         new_config = load_config_from_db()
-        AppState.recreate_with_new_config(new_config)
+        AppState.recreate_with_new_config(request.app, new_config)
     except Exception as e:
         logger.warning(f"Failed to reload config after batch update: {e}")
 
@@ -3,62 +3,87 @@ Task management routes.
 """
 
 import logging
+from contextlib import aclosing
 
-from fastapi import APIRouter, Request
-from sse_starlette.sse import EventSourceResponse
+import orjson
+from fastapi import APIRouter, Depends, Request, Response
+from pydantic import TypeAdapter
+from sse_starlette.sse import EventSourceResponse, ServerSentEvent
 
-from api.state import get_app_state
+from api.sse import PING_INTERVAL, sse_frame
+from api.state import get_task_service
 from exception import HTTPBadRequestException
+from models.responses import TaskResponse
+from services.task_service import TaskService
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+_TASKS_ADAPTER = TypeAdapter(list[TaskResponse])
+
 
 @router.get("/tasks/{task_id}")
-async def get_task(task_id: str, request: Request):
+async def get_task(task_id: str, task_service: TaskService = Depends(get_task_service)):
     """
     Get task status and statistics
     """
-    task_service = get_app_state(request).task_service
-
-    return await task_service.get_task(task_id)
+    task = await task_service.get_task(task_id)
+    # orjson encodes the DTO dataclass and its datetimes natively
+    return Response(orjson.dumps(task), media_type="application/json")
 
 
 @router.get("/tasks/{task_id}/stream")
-async def stream_task_progress(task_id: str, request: Request):
+async def stream_task_progress(
+    task_id: str,
+    request: Request,
+    task_service: TaskService = Depends(get_task_service),
+):
     """
     Stream task progress and logs using Server-Sent Events (SSE)
     """
-    task_service = get_app_state(request).task_service
-
-    return EventSourceResponse(task_service.get_task_stream_generator(task_id))
+    async def frames():
+        # aclosing() runs the generator's cleanup (its wakeup registration)
+        # as soon as we stop, rather than whenever it is garbage collected
+        async with aclosing(task_service.get_task_stream_generator(task_id)) as updates:
+            async for event, data in updates:
+                if await request.is_disconnected():
+                    logger.info("Client left task %s stream", task_id)
+                    return
+                # Pre-encoded bytes pass through EventSourceResponse untouched
+                yield sse_frame(event, data)
+
+    # Idle keepalive comes from sse-starlette's ping task, so the generator
+    # itself only wakes when the task changes
+    return EventSourceResponse(
+        frames(),
+        ping=int(PING_INTERVAL),
+        # "\n" line endings make the ping byte-identical to api.sse.PING_FRAME
+        ping_message_factory=lambda: ServerSentEvent(comment="ping", sep="\n"),
+        sep="\n",
+    )
 
 
 @router.get("/tasks/{task_id}/logs")
 async def get_task_logs(
     task_id: str,
-    request: Request,
     limit: int | None = None,
     offset: int = 0,
+    task_service: TaskService = Depends(get_task_service),
 ):
     """
     Get task logs (non-streaming, for historical viewing).
     If limit is omitted, returns all logs.
     """
-    task_service = get_app_state(request).task_service
-
     logs = await task_service.get_task_logs(task_id, limit=limit, offset=offset)
     total = task_service.task_log_repo.count_by_task(task_id)
     return {"logs": logs, "total": total}
 
 
 @router.post("/tasks/{task_id}/stop")
-async def stop_task(task_id: str, request: Request):
+async def stop_task(task_id: str, task_service: TaskService = Depends(get_task_service)):
     """
     Gracefully stop a running task
     """
-    task_service = get_app_state(request).task_service
-
     success = await task_service.stop_task(task_id)
     if not success:
         raise HTTPBadRequestException("任务不存在或不在执行中")
@@ -66,34 +91,32 @@ async def stop_task(task_id: str, request: Request):
 
 
 @router.post("/tasks/{task_id}/restart")
-async def restart_task(task_id: str, request: Request):
+async def restart_task(task_id: str, task_service: TaskService = Depends(get_task_service)):
     """
     Restart a completed or stopped task from scratch
     """
-    task_service = get_app_state(request).task_service
-
     return await task_service.restart_task(task_id)
 
 
 @router.post("/tasks/{task_id}/cleanup")
-async def cleanup_task(task_id: str, request: Request):
+async def cleanup_task(task_id: str, task_service: TaskService = Depends(get_task_service)):
     """
     Cleanup all resources produced by a task and reset it to pending
     """
-    task_service = get_app_state(request).task_service
-
     success = await task_service.cleanup_task(task_id)
     return {"success": success}
 
 
 @router.delete("/tasks/{task_id}")
-async def delete_task(task_id: str, request: Request, cleanup_resources: bool = False):
+async def delete_task(
+    task_id: str,
+    cleanup_resources: bool = False,
+    task_service: TaskService = Depends(get_task_service),
+):
     """
     Permanently delete a task. Set cleanup_resources=true to also remove
     documents, vectors and crawl cache produced by the task.
     """
-    task_service = get_app_state(request).task_service
-
     success = await task_service.delete_task(task_id, cleanup_resources)
     if not success:
         raise HTTPBadRequestException("任务不存在")
@@ -102,17 +125,14 @@ async def delete_task(task_id: str, request: Request, cleanup_resources: bool =
 
 @router.get("/tasks")
 async def list_tasks(
-    request: Request,
     collection_id: str | None = None,
     status: str | None = None,
     task_type: str | None = None,
+    task_service: TaskService = Depends(get_task_service),
 ):
     """
     List tasks with optional filters
     """
-    app_state = get_app_state(request)
-    task_service = app_state.task_service
-
     if collection_id:
         tasks = await task_service.list_task_responses(collection_id)
     else:
@@ -121,17 +141,18 @@ async def list_tasks(
         )
         tasks = [task_service._to_response(t) for t in tasks]
 
-    return {"tasks": tasks}
+    # Polled every few seconds by the import panel; skip jsonable_encoder
+    return Response(orjson.dumps({
+        "tasks": orjson.Fragment(_TASKS_ADAPTER.dump_json(tasks)),
+    }), media_type="application/json")
 
 
 @router.post("/tasks/restart-pending")
-async def restart_pending_tasks(request: Request):
+async def restart_pending_tasks(task_service: TaskService = Depends(get_task_service)):
     """
     Restart all failed tasks.
     Pending tasks are already in the worker queue (re-queued at startup).
     """
-    task_service = get_app_state(request).task_service
-
     restarted = []
     failed_tasks = task_service.task_repo.list_tasks_with_filters(status="failed")
     for task in failed_tasks:
@@ -0,0 +1,67 @@
+"""
+Raw Server-Sent Events framing for the streaming endpoints.
+"""
+
+import asyncio
+import functools
+from collections.abc import AsyncIterable, AsyncIterator
+
+from fastapi.responses import StreamingResponse
+
+# Keep proxies (nginx in particular) from caching or buffering the stream
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+# SSE comment line; clients ignore it, idle-timeout proxies see traffic
+PING_FRAME = b": ping\n\n"
+PING_INTERVAL = 15.0
+
+
+@functools.lru_cache(maxsize=64)
+def _frame_prefix(event: str) -> bytes:
+    # Event names come from a small fixed set, so each header is encoded once
+    return b"event: " + event.encode() + b"\ndata: "
+
+
+def sse_frame(event: str, data: bytes) -> bytes:
+    """Encode one SSE frame. ``data`` must be a single line, e.g. orjson output."""
+    return _frame_prefix(event) + data + b"\n\n"
+
+
+async def with_keepalive(frames: AsyncIterable[bytes], interval: float = PING_INTERVAL) -> AsyncIterator[bytes]:
+    """Interleave ``PING_FRAME`` whenever *frames* stays silent for *interval* seconds."""
+    source = frames.__aiter__()
+    next_frame: asyncio.Future | None = None
+    try:
+        while True:
+            if next_frame is None:
+                next_frame = asyncio.ensure_future(source.__anext__())
+            done, _ = await asyncio.wait({next_frame}, timeout=interval)
+            if not done:
+                yield PING_FRAME
+                continue
+
+            step, next_frame = next_frame, None
+            try:
+                frame = await step
+            except StopAsyncIteration:
+                break
+            yield frame
+    finally:
+        if next_frame is not None:
+            # Cancelling the in-flight step lets the source run its own cleanup
+            next_frame.cancel()
+            try:
+                await next_frame
+            except (asyncio.CancelledError, StopAsyncIteration):
+                pass
+
+
+def sse_response(frames: AsyncIterable[bytes], ping_interval: float | None = PING_INTERVAL) -> StreamingResponse:
+    """Stream pre-encoded SSE frames without any per-event re-encoding.
+
+    A keepalive comment is sent every *ping_interval* idle seconds; pass
+    ``None`` to disable it.
+    """
+    if ping_interval:
+        frames = with_keepalive(frames, ping_interval)
+    return StreamingResponse(frames, media_type="text/event-stream", headers=SSE_HEADERS)
@@ -6,11 +6,12 @@ import logging
 from dataclasses import dataclass
 
 from anthropic import AsyncAnthropic
-from fastapi import FastAPI, Request
+from fastapi import Depends, FastAPI, Request
 
 from chat.agent import AgentConfig
 from chat.agent.llm.claude import ClaudeToolBackend
 from chat.agent_service import AgentChatService
+from exception import HTTPInternalServerErrorException, HTTPNotFoundException
 from models.config import AppConfig
 from repository.chat import ChatMessageRepository, ChatRepository
 from repository.collection import CollectionRepository
@@ -63,6 +64,8 @@ class AppState:
                     context_window=200_000,
                     model="standard",
                     transcript_dir=config.agent.transcript_dir,
+                    stream_flush_chars=config.agent.stream_flush_chars,
+                    stream_flush_interval=config.agent.stream_flush_interval,
                 )
                 agent_chat_service = AgentChatService(
                     backend=agent_backend,
@@ -99,26 +102,22 @@ class AppState:
             raise
 
     @classmethod
-    def recreate_with_new_config(cls, config: AppConfig) -> "AppState":
-        """Recreate AppState with new configuration and update global reference."""
-        global _current_app_state
-
-        if _current_app_state:
+    def recreate_with_new_config(cls, app: FastAPI, config: AppConfig) -> "AppState":
+        """Recreate AppState with new configuration and swap it onto the app."""
+        current = getattr(app.state, "app_state", None)
+        if current:
             try:
-                _current_app_state.chat_service.close()
-                _current_app_state.document_service.close()
-                _current_app_state.collection_service.close()
-                _current_app_state.task_service.close()
+                current.chat_service.close()
+                current.document_service.close()
+                current.collection_service.close()
+                current.task_service.close()
                 logger.info("Closed previous services")
             except Exception as e:
                 logger.warning(f"Error closing previous services: {e}")
 
         new_state = cls.create_from_config(config)
-        _current_app_state = new_state
-
-        if _current_app:
-            _current_app.state.app_state = new_state
-            logger.info("Updated FastAPI app state with new configuration")
+        set_app_state(app, new_state)
+        logger.info("Updated FastAPI app state with new configuration")
 
         return new_state
 
@@ -134,16 +133,9 @@ class AppState:
             logger.error(f"Error closing services: {e}")
 
 
-_current_app_state: AppState | None = None
-_current_app: FastAPI | None = None
-
-
 def set_app_state(app: FastAPI, state: AppState):
     """Set the application state for the FastAPI app."""
-    global _current_app_state, _current_app
     app.state.app_state = state
-    _current_app_state = state
-    _current_app = app
 
 
 def get_app_state(request: Request) -> AppState:
@@ -153,3 +145,45 @@ def get_app_state(request: Request) -> AppState:
 
 def get_app_state_direct(app: FastAPI) -> AppState:
     return app.state.app_state
+
+
+# FastAPI dependency providers. They read app.state on every request rather than
+# caching, because settings changes swap in a new AppState at runtime.
+
+def get_chat_service(request: Request) -> ChatService:
+    return request.app.state.app_state.chat_service
+
+
+def get_collection_service(request: Request) -> CollectionService:
+    return request.app.state.app_state.collection_service
+
+
+def get_document_service(request: Request) -> DocumentService:
+    return request.app.state.app_state.document_service
+
+
+def get_task_service(request: Request) -> TaskService:
+    return request.app.state.app_state.task_service
+
+
+def get_chat_message_repo(request: Request) -> ChatMessageRepository:
+    # AppState has no repositories of its own; ChatService holds this one
+    return request.app.state.app_state.chat_service.chat_message_repo
+
+
+def get_agent_chat_service(request: Request) -> AgentChatService:
+    """Agent chat service, or 500 when it failed to initialize."""
+    agent_service = request.app.state.app_state.agent_chat_service
+    if agent_service is None:
+        raise HTTPInternalServerErrorException("Agent chat service not initialized")
+    return agent_service
+
+
+async def require_collection(
+    collection_id: str,
+    collection_service: CollectionService = Depends(get_collection_service),
+) -> str:
+    """The path's collection_id, or 404 when no such collection exists."""
+    if not await collection_service.collection_exists(collection_id):
+        raise HTTPNotFoundException(f"Collection '{collection_id}' not found")
+    return collection_id
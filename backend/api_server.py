@@ -4,7 +4,9 @@ FastAPI server entry point for AI Document Assistant.
 """
 
 import argparse
+import importlib.util
 import logging
+import os
 import sys
 from pathlib import Path
 
@@ -31,16 +33,47 @@ configure_logging(conf)
 
 logger = logging.getLogger(__name__)
 
+
+def _pick_impl(fast: str, fallback: str) -> str:
+    """Prefer the C-accelerated implementation when it is installed (uvloop has no Windows build)."""
+    return fast if importlib.util.find_spec(fast) is not None else fallback
+
+
 if __name__ == "__main__":
     # Parse command line arguments (for frontend integration)
     parser = argparse.ArgumentParser(description="AI Document Assistant API Server")
     parser.add_argument("--host", default="127.0.0.1", help="Host to bind to")
     parser.add_argument("--port", type=int, default=8888, help="Port to bind to")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.environ.get("WEB_CONCURRENCY", "1")),
+        help=(
+            "Number of worker processes (default: $WEB_CONCURRENCY or 1). Task workers and "
+            "chat cancellation state live in-process, so keep 1 unless those are externalized"
+        ),
+    )
+    parser.add_argument("--backlog", type=int, default=2048, help="Max pending connections")
+    parser.add_argument(
+        "--limit-concurrency",
+        type=int,
+        default=None,
+        help="Max concurrent connections before responding with 503",
+    )
+    parser.add_argument(
+        "--no-access-log",
+        action="store_true",
+        help="Disable uvicorn's per-request access log (recommended in production)",
+    )
 
     args = parser.parse_args()
 
+    loop = _pick_impl("uvloop", "asyncio")
+    http = _pick_impl("httptools", "h11")
+
     logger.info("Starting AI Document Assistant API server")
-    logger.info(f"Host: {args.host}, Port: {args.port}")
+    logger.info(f"Host: {args.host}, Port: {args.port}, Workers: {args.workers}")
+    logger.info(f"Event loop: {loop}, HTTP protocol: {http}")
     logger.info(f"Log level: {conf.system.log_level}")
 
     try:
@@ -48,8 +81,13 @@ if __name__ == "__main__":
             "api.main:app",
             host=args.host,
             port=args.port,
+            workers=args.workers,
+            loop=loop,
+            http=http,
+            backlog=args.backlog,
+            limit_concurrency=args.limit_concurrency,
             log_level=conf.system.log_level,
-            access_log=True,
+            access_log=not args.no_access_log,
         )
     except Exception as e:
         logger.error(f"Failed to start API server: {e}", exc_info=True)
@@ -12,13 +12,14 @@ from chat.agent.compaction import auto_compact, estimate_tokens, micro_compact
 from chat.agent.loop_detector import LoopDetector
 from chat.agent.prompts import LOOP_WARNING_PROMPT, MAX_ITER_PROMPT_SUFFIX, RAG_SYSTEM_PROMPT
 from chat.agent.registry import ToolRegistry
+from chat.agent.tools.base import ToolContext
 from chat.agent.trace import TranscriptWriter
 from chat.models import SSEEvent, SSEEventType
 from models.config import AgentConfig
 
 if TYPE_CHECKING:
     from chat.agent.llm.base import ToolCallingBackend
-    from chat.agent.tools.base import AgentDeps, ToolContext
+    from chat.agent.tools.base import AgentDeps
 
 logger = logging.getLogger(__name__)
 
@@ -449,9 +450,7 @@ class AgentRuntime:
         deps: "AgentDeps",
         visited_doc_ids: set[str],
         document_ids: list[str] | None = None,
-    ) -> "ToolContext":
-        from chat.agent.tools.base import ToolContext
-
+    ) -> ToolContext:
         return ToolContext(
             chat_id=chat_id,
             collection_ids=collection_ids,
@@ -0,0 +1,90 @@
+"""Coalesce per-token agent events before they go over the wire."""
+
+import asyncio
+from collections.abc import AsyncIterator
+
+from chat.models import SSEEvent, SSEEventType
+
+
+async def coalesce_thinking(
+    events: AsyncIterator[SSEEvent],
+    max_chars: int = 64,
+    max_delay: float = 0.03,
+) -> AsyncIterator[SSEEvent]:
+    """Merge consecutive AGENT_THINKING deltas of the same iteration.
+
+    A merged delta is flushed once it reaches *max_chars*, once *max_delay*
+    seconds have passed since its first token, or as soon as any other event
+    arrives, so event ordering is preserved. ``max_chars <= 1`` disables
+    coalescing.
+    """
+    if max_chars <= 1:
+        async for event in events:
+            yield event
+        return
+
+    loop = asyncio.get_running_loop()
+    source = events.__aiter__()
+    next_event: asyncio.Future | None = None
+    pending: SSEEvent | None = None
+    parts: list[str] = []
+    size = 0
+    deadline = 0.0
+
+    def flush() -> SSEEvent:
+        nonlocal pending, size
+        event = SSEEvent(
+            type=SSEEventType.AGENT_THINKING,
+            data={**pending.data, "delta": "".join(parts)},
+        )
+        pending = None
+        parts.clear()
+        size = 0
+        return event
+
+    try:
+        while True:
+            if next_event is None:
+                next_event = asyncio.ensure_future(source.__anext__())
+
+            if pending is not None:
+                # Wait for the next token only until the window closes
+                timeout = max(0.0, deadline - loop.time())
+                done, _ = await asyncio.wait({next_event}, timeout=timeout)
+                if not done:
+                    yield flush()
+                    continue
+
+            step, next_event = next_event, None
+            try:
+                event = await step
+            except StopAsyncIteration:
+                break
+
+            if event.type is SSEEventType.AGENT_THINKING:
+                if pending is not None and pending.data.get("iteration") != event.data.get("iteration"):
+                    yield flush()
+                if pending is None:
+                    pending = event
+                    deadline = loop.time() + max_delay
+                delta = event.data.get("delta", "")
+                parts.append(delta)
+                size += len(delta)
+                if size >= max_chars:
+                    yield flush()
+                continue
+
+            if pending is not None:
+                yield flush()
+            yield event
+
+        if pending is not None:
+            yield flush()
+    finally:
+        if next_event is not None:
+            # Cancelling the in-flight step lets the source run its own cleanup
+            next_event.cancel()
+            try:
+                await next_event
+            except (asyncio.CancelledError, StopAsyncIteration):
+                pass
@@ -1,5 +1,6 @@
 """Document read tools for the agent."""
 
+from chat.agent.tools._formatting import parse_json_keywords
 from chat.agent.tools.base import Tool, ToolContext, ToolResult
 
 
@@ -118,8 +119,6 @@ class GetDocumentSummaryTool(Tool):
                 is_error=True,
             )
 
-        from chat.agent.tools._formatting import parse_json_keywords
-
         name = summary.get("name") or "(unnamed)"
         category = summary.get("category") or "(none)"
         keywords_raw = summary.get("keywords")
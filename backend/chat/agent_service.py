@@ -7,11 +7,14 @@ import time
 import uuid
 from collections.abc import AsyncIterator
 
+import orjson
+
 from chat.agent import AgentConfig, AgentDeps, AgentRuntime, build_default_registry
 from chat.agent.cancellation import CancellationToken
 from chat.agent.llm.base import ToolCallingBackend
 from chat.agent.trace import TranscriptWriter
 from chat.models import SSEEvent, SSEEventType
+from database.connection import session_context
 from repository.chat import ChatMessageRepository, ChatRepository
 from repository.collection import CollectionRepository
 from repository.document import DocumentRepository
@@ -51,51 +54,39 @@ class AgentChatService:
         token = CancellationToken()
         _cancel_registry[(chat_id, message_id)] = token
 
-        # Build user message metadata
-        user_meta: dict = {"engine": "agent"}
-        if document_ids:
-            user_meta["document_ids"] = document_ids
-            # Store document names for frontend display
-            doc_names: list[str] = []
-            for did in document_ids:
-                try:
-                    doc = self.document_repo.get_by_id(did)
-                    doc_names.append(doc.name if doc else did)
-                except Exception:
-                    doc_names.append(did)
-            user_meta["document_names"] = doc_names
-
-        # Persist user message with engine marker so _load_history includes it
-        user_message = self.chat_message_repo.add_message(
-            chat_id=chat_id,
-            role="user",
-            content=query,
-            metadata=json.dumps(user_meta),
-        )
-        user_message_id = user_message.id
-
-        # Placeholder message
-        placeholder = self.chat_message_repo.add_message(
-            chat_id=chat_id,
-            role="assistant",
-            content="",
-            metadata=json.dumps({"status": "pending", "engine": "agent"}),
-        )
-        placeholder_id = placeholder.id
-
-        transcript = TranscriptWriter(
-            self.config.transcript_dir, chat_id, message_id
-        )
+        user_message_id: str | None = None
+        placeholder_id: str | None = None
+        start_turn: asyncio.Future | None = None
 
         try:
+            # Build user message metadata
+            user_meta: dict = {"engine": "agent"}
+            if document_ids:
+                user_meta["document_ids"] = document_ids
+                # Store document names for frontend display
+                user_meta["document_names"] = await asyncio.to_thread(
+                    self._get_document_names, document_ids
+                )
+
+            # Repository calls are blocking; run them in the thread pool so a stream
+            # that is persisting messages doesn't stall every other connection.
+            # Shielded so a cancel arriving mid-write doesn't lose the ids of rows
+            # the thread goes on to commit
+            start_turn = asyncio.ensure_future(asyncio.to_thread(
+                self._start_turn, chat_id, query, user_meta
+            ))
+            user_message_id, placeholder_id, history, collection_ids = await asyncio.shield(start_turn)
+
+            transcript = TranscriptWriter(
+                self.config.transcript_dir, chat_id, message_id
+            )
+
             with transcript:
-                history = self._load_history(chat_id)
                 # Remove the current user message from history — runtime.append()
                 # adds it separately. Without this, the LLM sees a duplicate
                 # user message and loses conversation context.
                 if history and history[-1].get("role") == "user" and history[-1].get("content") == query:
                     history = history[:-1]
-                collection_ids = self._get_collection_ids(chat_id)
 
                 deps = AgentDeps(
                     collection_repo=self.collection_repo,
@@ -260,29 +251,90 @@ class AgentChatService:
                 agent_trace["messages"] = self._reconstruct_messages(history, query, thinking_buffer, sources)
                 agent_trace["ui_state"] = ui_state
 
-                # Persist final answer
+                # Persist final answer. Kept synchronous: if a cancellation landed
+                # while awaiting a thread, the write could still complete and the
+                # except-branch below would then delete the finished answer.
                 self.chat_message_repo.update(
                     placeholder_id,
                     content=thinking_buffer,
-                    sources=json.dumps(sources),
-                    message_metadata=json.dumps(agent_trace),
+                    sources=orjson.dumps(sources).decode(),
+                    message_metadata=orjson.dumps(
+                        agent_trace, option=orjson.OPT_NON_STR_KEYS
+                    ).decode(),
                 )
         except asyncio.CancelledError:
             # User-initiated stop (or client disconnect). Keep their question,
             # but drop the empty assistant placeholder so the chat doesn't
-            # show a half-baked reply bubble on reload.
-            self.chat_message_repo.delete(placeholder_id)
-            self.chat_repo.update_message_count(chat_id)
+            # show a half-baked reply bubble on reload. Synchronous on purpose:
+            # under anyio cancellation any further await here is cancelled again.
+            if placeholder_id is not None:
+                self.chat_message_repo.delete(placeholder_id)
+                self.chat_repo.update_message_count(chat_id)
+            elif start_turn is not None:
+                # Cancelled while _start_turn was still writing; drop the
+                # placeholder once it has been committed
+                start_turn.add_done_callback(
+                    lambda done: self._discard_late_placeholder(chat_id, done)
+                )
             raise
         except Exception:
-            # Clean up: remove both user message and placeholder on failure
-            self.chat_message_repo.delete(placeholder_id)
-            self.chat_message_repo.delete(user_message_id)
-            self.chat_repo.update_message_count(chat_id)
+            # Clean up: remove both user message and placeholder on failure.
+            # If _start_turn itself failed, its session rolled back both rows
+            if placeholder_id is not None:
+                self.chat_message_repo.delete(placeholder_id)
+                self.chat_message_repo.delete(user_message_id)
+                self.chat_repo.update_message_count(chat_id)
             raise
         finally:
             _cancel_registry.pop((chat_id, message_id), None)
 
+    def _discard_late_placeholder(self, chat_id: str, start_turn: asyncio.Future) -> None:
+        """Delete the placeholder of a turn cancelled before _start_turn returned"""
+        if start_turn.cancelled() or start_turn.exception() is not None:
+            return
+        _, placeholder_id, _, _ = start_turn.result()
+        self.chat_message_repo.delete(placeholder_id)
+        self.chat_repo.update_message_count(chat_id)
+
+    def _start_turn(
+        self, chat_id: str, query: str, user_meta: dict
+    ) -> tuple[str, str, list[dict], list[str]]:
+        """Persist the user message and placeholder, then load the turn context.
+
+        Runs in a single DB session (one connection checkout, one commit).
+        """
+        with session_context():
+            # Persist user message with engine marker so _load_history includes it
+            user_message = self.chat_message_repo.add_message(
+                chat_id=chat_id,
+                role="user",
+                content=query,
+                metadata=orjson.dumps(user_meta).decode(),
+            )
+
+            # Placeholder message
+            placeholder = self.chat_message_repo.add_message(
+                chat_id=chat_id,
+                role="assistant",
+                content="",
+                metadata=orjson.dumps({"status": "pending", "engine": "agent"}).decode(),
+            )
+
+            history = self._load_history(chat_id)
+            collection_ids = self._get_collection_ids(chat_id)
+
+        return user_message.id, placeholder.id, history, collection_ids
+
+    def _get_document_names(self, document_ids: list[str]) -> list[str]:
+        doc_names: list[str] = []
+        for did in document_ids:
+            try:
+                doc = self.document_repo.get_by_id(did)
+                doc_names.append(doc.name if doc else did)
+            except Exception:
+                doc_names.append(did)
+        return doc_names
+
     def _load_history(self, chat_id: str) -> list[dict]:
         """Load conversation history for agent mode.
 
@@ -300,8 +352,8 @@ class AgentChatService:
             if msg.role not in ("user", "assistant"):
                 continue
             try:
-                meta = json.loads(msg.message_metadata or "{}")
-            except json.JSONDecodeError:
+                meta = orjson.loads(msg.message_metadata or "{}")
+            except orjson.JSONDecodeError:
                 meta = {}
             if meta.get("engine") != "agent":
                 continue
@@ -319,7 +371,7 @@ class AgentChatService:
             if chat is None:
                 return []
             raw = chat.collection_ids or "[]"
-            parsed = json.loads(raw)
+            parsed = orjson.loads(raw)
             if isinstance(parsed, list):
                 return parsed
         except Exception:
@@ -25,8 +25,6 @@ class DocumentIndex(BaseIndex):
     def index_document(self, document_id: str, title: str = "", summary: str = "",
                        keywords: list[str] = None, **metadata) -> None:
         """Update existing documents table with search-related fields."""
-        from sqlalchemy import text
-
         # Build parameterised update using a whitelist of known columns
         set_clauses: list[str] = []
         params: dict = {"doc_id": document_id}
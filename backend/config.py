@@ -14,6 +14,7 @@ from models.config import (
     LLMConfig,
     LLMEndpointConfig,
     SystemConfig,
+    TaskConfig,
 )
 
 # Fixed paths and configuration
@@ -109,6 +110,7 @@ def load_config_from_db() -> AppConfig:
         system=SystemConfig(
             log_level=_s("LOG_LEVEL", "info"),
         ),
+        task=TaskConfig.from_env(),
     )
 
     config.ensure_directories_exist()
@@ -58,7 +58,7 @@ class DocumentSpider(scrapy.Spider):
         return spider
 
     def spider_closed(self, spider):
-        spider.logger.info(f"Spider closed. Crawled {len(self.results)} pages")
+        spider.logger.info("Spider closed. Crawled %d pages", len(self.results))
 
     def _is_same_domain(self, url1: str, url2: str) -> bool:
         """Check if URLs are from the same domain"""
@@ -106,7 +106,7 @@ class DocumentSpider(scrapy.Spider):
             return title, markdown_content, links
 
         except Exception as e:
-            self.logger.error(f"Content extraction failed for {response.url}: {e}")
+            self.logger.error("Content extraction failed for %s: %s", response.url, e)
             return "", "", []
 
     def parse(self, response: Response) -> Generator[Any, None, None]:
@@ -142,7 +142,7 @@ class DocumentSpider(scrapy.Spider):
                     yield response.follow(link, callback=self.parse, meta={"depth": current_depth + 1})
 
         except Exception as e:
-            self.logger.error(f"Parse error for {response.url}: {e}")
+            self.logger.error("Parse error for %s: %s", response.url, e)
             result = {
                 "url": response.url,
                 "title": "",
@@ -159,7 +159,7 @@ class DocumentSpider(scrapy.Spider):
 
     def errback(self, failure):
         """Handle request failures"""
-        self.logger.error(f"Request failed: {failure}")
+        self.logger.error("Request failed: %s", failure)
         crawl_time = time.time() - self.start_time
         result = {
             "url": failure.request.url,
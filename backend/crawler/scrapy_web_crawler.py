@@ -89,7 +89,7 @@ class ScrapyWebCrawler:
             "Sec-Fetch-Site": "none",
         }
 
-        logger.info(f"Initialized ScrapyWebCrawler with config: {self.config}")
+        logger.info("Initialized ScrapyWebCrawler with config: %s", self.config)
 
     def _create_spider_script(self) -> str:
         """Get path to standalone spider script"""
@@ -135,7 +135,7 @@ class ScrapyWebCrawler:
                 result_file,
             ]
 
-            logger.info(f"Running Scrapy spider: {' '.join(cmd)}")
+            logger.info("Running Scrapy spider: %s", " ".join(cmd))
 
             # Run with timeout
             process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
@@ -147,7 +147,7 @@ class ScrapyWebCrawler:
             stdout, stderr = process.communicate(timeout=300)  # 5 minute timeout
 
             if process.returncode != 0:
-                logger.error(f"Scrapy spider failed: {stderr}")
+                logger.error("Scrapy spider failed: %s", stderr)
                 return []
 
             # Read and convert results
@@ -161,7 +161,7 @@ class ScrapyWebCrawler:
                 process.wait()
             return []
         except Exception as e:
-            logger.error(f"Error running Scrapy spider: {e}")
+            logger.error("Error running Scrapy spider: %s", e)
             return []
         finally:
             # Cleanup
@@ -199,7 +199,7 @@ class ScrapyWebCrawler:
             with open(result_file) as f:
                 return json.load(f)
         except Exception as e:
-            logger.error(f"Error reading results: {e}")
+            logger.error("Error reading results: %s", e)
             return []
 
     def _convert_result(self, raw_result: dict) -> ScrapyCrawlResult:
@@ -60,7 +60,7 @@ class SimpleWebCrawler:
         self.session = requests.Session()
         self.session.headers.update(self.headers)
 
-        logger.info(f"Initialized SimpleWebCrawler with delay={self.delay}s")
+        logger.info("Initialized SimpleWebCrawler with delay=%ss", self.delay)
 
     def stop(self) -> None:
         """Signal the crawler to stop as soon as possible."""
@@ -210,7 +210,7 @@ class SimpleWebCrawler:
                     success=True,
                 )
             except Exception as e:
-                logger.warning(f"Failed to fetch markdown alternate {md_url}: {e}, falling back to HTML")
+                logger.warning("Failed to fetch markdown alternate %s: %s, falling back to HTML", md_url, e)
 
         title, content, links = self._extract_content(html_content, url)
         return SimpleCrawlResult(
@@ -242,10 +242,10 @@ class SimpleWebCrawler:
                     if not any(url.lower().startswith(p.lower()) for p in recursive_prefixes):
                         continue
                 urls.append(url)
-            logger.info(f"Found {len(urls)} URLs in sitemap.xml at {sitemap_url}")
+            logger.info("Found %d URLs in sitemap.xml at %s", len(urls), sitemap_url)
             return urls
         except Exception as e:
-            logger.info(f"sitemap.xml not available at {sitemap_url}: {e}")
+            logger.info("sitemap.xml not available at %s: %s", sitemap_url, e)
             return []
 
     def crawl_single_url(self, url: str) -> SimpleCrawlResult:
@@ -293,7 +293,7 @@ class SimpleWebCrawler:
             # Merge user-provided URLs (priority) with sitemap-discovered URLs
             merged = list(dict.fromkeys(list(urls) + sitemap_urls))
             to_crawl = [url for url in merged if url not in skip_urls]
-            logger.info(f"Using sitemap.xml: {len(merged)} URLs found, {len(to_crawl)} after skip")
+            logger.info("Using sitemap.xml: %d URLs found, %d after skip", len(merged), len(to_crawl))
         else:
             to_crawl = list(urls)
             logger.info("No sitemap.xml found, starting BFS from provided URLs")
@@ -308,14 +308,14 @@ class SimpleWebCrawler:
 
             crawled_urls.add(url)
 
-            logger.info(f"Crawling {url} | done: {yielded} | queued: {len(to_crawl)}")
+            logger.info("Crawling %s | done: %d | queued: %d", url, yielded, len(to_crawl))
             if progress_callback:
                 progress_callback(url, yielded, yielded + len(to_crawl))
 
             try:
                 result = self._fetch_page(url)
             except RuntimeError as e:
-                logger.info(f"Crawl stopped: {e}")
+                logger.info("Crawl stopped: %s", e)
                 raise
             except Exception as e:
                 failed_urls.add(url)
@@ -323,7 +323,7 @@ class SimpleWebCrawler:
                     url=url, title="", content="",
                     links=[], success=False, error=str(e),
                 )
-                logger.warning(f"Failed to crawl {url}: {e}")
+                logger.warning("Failed to crawl %s: %s", url, e)
                 yield result
                 yielded += 1
                 time.sleep(self.delay)
@@ -6,7 +6,7 @@ from contextlib import contextmanager
 from contextvars import ContextVar
 from typing import Optional
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import Session, sessionmaker
 
 _host = os.environ["POSTGRES_HOST"]
@@ -15,20 +15,38 @@ _user = os.environ["POSTGRES_USER"]
 _password = os.environ["POSTGRES_PASSWORD"]
 _db = os.environ["POSTGRES_DB"]
 DATABASE_URL = f"postgresql://{_user}:{_password}@{_host}:{_port}/{_db}"
+POOL_SIZE = int(os.environ.get("POSTGRES_POOL_SIZE", "5"))
+MAX_OVERFLOW = int(os.environ.get("POSTGRES_MAX_OVERFLOW", "10"))
+POOL_RECYCLE = int(os.environ.get("POSTGRES_POOL_RECYCLE", "1800"))
 
-# Create engine
+# 进程内唯一的引擎与连接池，所有 repository 共用；多 worker 时每个进程各自一份，
+# 总连接数上限为 workers * (POOL_SIZE + MAX_OVERFLOW)
 engine = create_engine(
     DATABASE_URL,
     echo=False,
     pool_pre_ping=True,
-    pool_size=5,
-    max_overflow=10,
+    pool_size=POOL_SIZE,
+    max_overflow=MAX_OVERFLOW,
+    pool_recycle=POOL_RECYCLE,
 )
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+def warmup_pool(connections: int = POOL_SIZE) -> None:
+    """预先建立连接池中的连接，避免首个请求承担建连开销"""
+    opened = []
+    try:
+        for _ in range(connections):
+            conn = engine.connect()
+            opened.append(conn)
+            conn.execute(text("SELECT 1"))
+    finally:
+        for conn in opened:
+            conn.close()
+
+
 _current_session: ContextVar[Optional[Session]] = ContextVar[Optional[Session]]("_current_session", default=None)
 
 
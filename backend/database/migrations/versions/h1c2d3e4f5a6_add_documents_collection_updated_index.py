@@ -0,0 +1,33 @@
+"""add (collection_id, updated_at, id) index on documents
+
+Revision ID: h1c2d3e4f5a6
+Revises: f1a2b3c4d5e6
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'h1c2d3e4f5a6'
+down_revision: Union[str, Sequence[str], None] = 'f1a2b3c4d5e6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Index the document list's filter and sort order so pages come straight off the index."""
+    op.create_index(
+        'idx_documents_collection_updated',
+        'documents',
+        ['collection_id', sa.text('updated_at DESC'), sa.text('id DESC')],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Drop the document list index."""
+    op.drop_index('idx_documents_collection_updated', table_name='documents')
@@ -193,6 +193,11 @@ class Document(Base):
         Index("idx_documents_status", "status"),
         Index("idx_documents_hash", "hash_md5"),
         Index("idx_documents_updated_at", "updated_at"),
+        # Serves list_documents: filter by collection, newest first, keyset on id
+        Index(
+            "idx_documents_collection_updated",
+            "collection_id", updated_at.desc(), id.desc()
+        ),
         Index("idx_documents_source_task_id", "source_task_id"),
     )
 
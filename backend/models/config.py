@@ -142,6 +142,29 @@ class SystemConfig:
         )
 
 
+@dataclass
+class TaskConfig:
+    """Background task worker configuration."""
+
+    worker_concurrency: int = 1  # queue consumers on the worker event loop
+    worker_batch_size: int = 1  # task ids pulled from the queue per round trip
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(**data)
+
+    @classmethod
+    def from_env(cls):
+        """Load configuration from environment variables."""
+        return cls(
+            worker_concurrency=int(os.getenv("TASK_WORKER_CONCURRENCY", "1")),
+            worker_batch_size=int(os.getenv("TASK_WORKER_BATCH_SIZE", "1")),
+        )
+
+
 @dataclass
 class AgentConfig:
     """Agent loop configuration."""
@@ -162,6 +185,10 @@ class AgentConfig:
     loop_similar_call_threshold: int = 2
     loop_stagnation_window: int = 4
 
+    # SSE streaming: thinking deltas are merged until either limit is hit
+    stream_flush_chars: int = 64
+    stream_flush_interval: float = 0.03
+
     def to_dict(self) -> dict:
         return asdict(self)
 
@@ -179,6 +206,7 @@ class AppConfig:
     knowledge_base: KnowledgeBaseConfig = field(default_factory=KnowledgeBaseConfig)
     system: SystemConfig = field(default_factory=SystemConfig)
     agent: AgentConfig = field(default_factory=AgentConfig)
+    task: TaskConfig = field(default_factory=TaskConfig)
 
     def to_dict(self) -> dict:
         return asdict(self)
@@ -191,6 +219,7 @@ class AppConfig:
             knowledge_base=KnowledgeBaseConfig.from_dict(data.get("knowledge_base", {})),
             system=SystemConfig.from_dict(data.get("system", {})),
             agent=AgentConfig.from_dict(data.get("agent", {})),
+            task=TaskConfig.from_dict(data.get("task", {})),
         )
 
     @classmethod
@@ -239,6 +268,7 @@ class AppConfig:
             knowledge_base=KnowledgeBaseConfig.from_dict(data.get("knowledge_base", {})),
             system=SystemConfig.from_dict(data.get("system", {})),
             agent=AgentConfig.from_dict(data.get("agent", {})),
+            task=TaskConfig.from_dict(data.get("task", {})),
         )
 
     @classmethod
@@ -249,6 +279,7 @@ class AppConfig:
             embedding=EmbeddingConfig.from_env(),
             knowledge_base=KnowledgeBaseConfig(),
             system=SystemConfig.from_env(),
+            task=TaskConfig.from_env(),
         )
 
     def to_toml_file(self, file_path: Optional[Path] = None) -> None:
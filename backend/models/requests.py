@@ -57,7 +57,7 @@ class UpdateSettingsRequest(BaseModel):
 
 class IngestFilesRequest(BaseModel):
     """Request model for file ingestion"""
-    files: list[str] = Field(..., description="List of file or folder paths to process")
+    files: list[str] = Field(..., min_length=1, description="List of file or folder paths to process")
 
 
 class UrlConfig(BaseModel):
@@ -74,7 +74,7 @@ class IngestUrlsRequest(BaseModel):
     urls: Optional[list[str]] = Field(None, description="List of URLs to crawl")
     recursive_prefix: Optional[str] = Field(None, description="Recursive prefix for crawling")
     # New format
-    url_configs: Optional[list[UrlConfig]] = Field(None, description="Multiple URL configs with independent prefixes")
+    url_configs: Optional[list[UrlConfig]] = Field(None, min_length=1, description="Multiple URL configs with independent prefixes")
     # Categorization options
     categorize_mode: str = Field(default="auto", description="Categorization mode: auto, path_only, ai_only, or skip")
     generate_readme: bool = Field(default=True, description="Whether to generate README after ingestion")
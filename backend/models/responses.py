@@ -98,7 +98,8 @@ class ListDocumentsResponse(BaseModel):
     documents: list[DocumentResponse] = Field(..., description="List of documents")
     page: int = Field(..., description="Current page number")
     page_size: int = Field(..., description="Page size")
-    total: int = Field(..., description="Total number of documents")
+    total: Optional[int] = Field(None, description="Total number of documents, omitted unless requested")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, null on the last page")
 
 
 class SettingsResponse(BaseModel):
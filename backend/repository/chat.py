@@ -1,10 +1,11 @@
 """Chat and ChatMessage repositories."""
 
+from collections.abc import Iterator
 from typing import Optional
 
-from sqlalchemy import func, select
+from sqlalchemy import delete, func, select, tuple_
 
-from database.connection import session_context
+from database.connection import SessionLocal, session_context
 from database.models.chat import Chat, ChatMessage
 from models.dto import ChatDTO, ChatMessageDTO
 from repository.base import BaseRepository
@@ -20,7 +21,7 @@ class ChatRepository(BaseRepository[Chat, ChatDTO]):
         with session_context() as session:
             query = (
                 select(Chat)
-                .order_by(Chat.sort_order.asc())
+                .order_by(Chat.sort_order.asc(), Chat.id.asc())
                 .offset(offset)
             )
 
@@ -30,6 +31,37 @@ class ChatRepository(BaseRepository[Chat, ChatDTO]):
             entities = list(session.scalars(query))
             return [self.dto_class.from_orm(item) for item in entities]
 
+    def get_page_with_total(self, offset: int = 0, limit: Optional[int] = None) -> tuple[list[ChatDTO], int]:
+        """Return a page of chats and the total chat count.
+
+        The total comes from a COUNT(*) OVER () window in the same query.
+        """
+        with session_context() as session:
+            query = (
+                select(Chat, func.count().over())
+                .order_by(Chat.sort_order.asc(), Chat.id.asc())
+                .offset(offset)
+            )
+
+            if limit:
+                query = query.limit(limit)
+
+            rows = session.execute(query).all()
+            if rows:
+                total = rows[0][1]
+            else:
+                # Past the last page there is no row to carry the window count
+                total = self.count_all() if offset else 0
+            return [self.dto_class.from_orm(row[0]) for row in rows], total
+
+    def get_page_after(self, after: Optional[tuple[int, str]], limit: int) -> list[ChatDTO]:
+        """Keyset page of chats following the (sort_order, id) key *after*."""
+        with session_context() as session:
+            query = select(Chat).order_by(Chat.sort_order.asc(), Chat.id.asc()).limit(limit)
+            if after is not None:
+                query = query.where(tuple_(Chat.sort_order, Chat.id) > tuple_(*after))
+            return [self.dto_class.from_orm(item) for item in session.scalars(query)]
+
     def next_sort_order(self) -> int:
         """Return the next sort_order value (max + 1, or 0 for empty table)."""
         with session_context() as session:
@@ -113,6 +145,7 @@ class ChatMessageRepository(BaseRepository[ChatMessage, ChatMessageDTO]):
 
     def __init__(self):
         super().__init__(ChatMessage, ChatMessageDTO)
+        self.chat_repo = ChatRepository()
 
     def get_by_chat(self, chat_id: str, offset: int = 0, limit: Optional[int] = None) -> list[ChatMessageDTO]:
         with session_context() as session:
@@ -129,6 +162,57 @@ class ChatMessageRepository(BaseRepository[ChatMessage, ChatMessageDTO]):
             entities = list(session.scalars(query))
             return [self.dto_class.from_orm(item) for item in entities]
 
+    def get_page_by_chat(
+        self, chat_id: str, offset: int = 0, limit: Optional[int] = None
+    ) -> tuple[list[ChatMessageDTO], int]:
+        """Return a page of messages and the chat's total message count.
+
+        The total comes from a COUNT(*) OVER () window in the same query, so
+        a page costs one round trip instead of two.
+        """
+        with session_context() as session:
+            query = (
+                select(ChatMessage, func.count().over())
+                .where(ChatMessage.chat_id == chat_id)
+                .order_by(ChatMessage.created_at.asc())
+                .offset(offset)
+            )
+
+            if limit:
+                query = query.limit(limit)
+
+            rows = session.execute(query).all()
+            if rows:
+                total = rows[0][1]
+            else:
+                # Past the last page there is no row to carry the window count
+                total = self.count_by_chat(chat_id) if offset else 0
+            return [self.dto_class.from_orm(row[0]) for row in rows], total
+
+    def iter_by_chat(
+        self, chat_id: str, offset: int = 0, limit: Optional[int] = None, batch_size: int = 100
+    ) -> Iterator[ChatMessageDTO]:
+        """Yield messages in order from a server-side cursor, *batch_size* rows at a time.
+
+        Uses its own session rather than session_context: the iterator is
+        consumed across thread-pool hops by a streaming response and may be
+        abandoned half way when the client disconnects.
+        """
+        with SessionLocal() as session:
+            query = (
+                select(ChatMessage)
+                .where(ChatMessage.chat_id == chat_id)
+                .order_by(ChatMessage.created_at.asc())
+                .offset(offset)
+                .execution_options(yield_per=batch_size)
+            )
+
+            if limit:
+                query = query.limit(limit)
+
+            for entity in session.scalars(query):
+                yield self.dto_class.from_orm(entity)
+
     def count_by_chat(self, chat_id: str) -> int:
         with session_context() as session:
             return session.scalar(
@@ -170,8 +254,7 @@ class ChatMessageRepository(BaseRepository[ChatMessage, ChatMessageDTO]):
             message_dto = self.dto_class.from_orm(message)
 
         # Update chat statistics
-        chat_repo = ChatRepository()
-        chat_repo.update_message_count(chat_id)
+        self.chat_repo.update_message_count(chat_id)
 
         return message_dto
 
@@ -211,7 +294,6 @@ class ChatMessageRepository(BaseRepository[ChatMessage, ChatMessageDTO]):
             return self.dto_class.from_orm(entity)
 
     def delete_by_chat(self, chat_id: str) -> int:
-        from sqlalchemy import delete
         with session_context() as session:
             stmt = delete(ChatMessage).where(ChatMessage.chat_id == chat_id)
             result = session.execute(stmt)
@@ -2,10 +2,11 @@
 
 from typing import Optional
 
-from sqlalchemy import func, select
+from sqlalchemy import func, or_, select
 
 from database.connection import session_context
 from database.models.collection import Collection
+from database.models.document import Document, DocumentChunk
 from models.dto import CollectionDTO
 from repository.base import BaseRepository
 
@@ -16,6 +17,15 @@ class CollectionRepository(BaseRepository[Collection, CollectionDTO]):
     def __init__(self):
         super().__init__(Collection, CollectionDTO)
 
+    def get_existing_ids(self, collection_ids: list[str]) -> set[str]:
+        """Return the subset of the given IDs that exist, in a single query."""
+        if not collection_ids:
+            return set()
+        with session_context() as session:
+            return set(session.scalars(
+                select(Collection.id).where(Collection.id.in_(collection_ids))
+            ))
+
     def search_by_name(self, search_term: str) -> list[CollectionDTO]:
         with session_context() as session:
             query = select(Collection).where(
@@ -32,7 +42,6 @@ class CollectionRepository(BaseRepository[Collection, CollectionDTO]):
                 return None
 
             # Update document count from actual documents
-            from database.models.document import Document
             doc_count = session.scalar(
                 select(func.count(Document.id)).where(
                     Document.collection_id == collection_id
@@ -40,7 +49,6 @@ class CollectionRepository(BaseRepository[Collection, CollectionDTO]):
             ) or 0
 
             # Update chunk count from actual chunks
-            from database.models.document import DocumentChunk
             vector_count = session.scalar(
                 select(func.count(DocumentChunk.id)).where(
                     DocumentChunk.collection_id == collection_id
@@ -63,7 +71,6 @@ class CollectionRepository(BaseRepository[Collection, CollectionDTO]):
                 return False
 
             # Count documents
-            from database.models.document import Document
             doc_count = session.scalar(
                 select(func.count(Document.id)).where(
                     Document.collection_id == collection_id
@@ -71,7 +78,6 @@ class CollectionRepository(BaseRepository[Collection, CollectionDTO]):
             ) or 0
 
             # Count chunks/vectors
-            from database.models.document import DocumentChunk
             vector_count = session.scalar(
                 select(func.count(DocumentChunk.id)).where(
                     DocumentChunk.collection_id == collection_id
@@ -92,7 +98,10 @@ class CollectionRepository(BaseRepository[Collection, CollectionDTO]):
             query = select(Collection)
 
             if search:
-                query = query.where(Collection.name.ilike(f"%{search}%"))
+                pattern = f"%{search}%"
+                query = query.where(
+                    or_(Collection.name.ilike(pattern), Collection.description.ilike(pattern))
+                )
 
             query = query.order_by(Collection.created_at.desc()).offset(offset)
 
@@ -3,7 +3,7 @@
 from datetime import datetime, timezone
 from typing import Optional
 
-from sqlalchemy import func, select, update
+from sqlalchemy import delete, func, select, tuple_, update
 
 from database.connection import session_context
 from database.models.document import Document, DocumentChunk
@@ -24,8 +24,10 @@ class DocumentRepository(BaseRepository[Document, DocumentDTO]):
         exclude_statuses: Optional[list[str]] = None,
         search: Optional[str] = None,
         offset: int = 0,
-        limit: Optional[int] = None
+        limit: Optional[int] = None,
+        after: Optional[tuple[datetime, str]] = None
     ) -> list[DocumentDTO]:
+        """List documents newest first; *after* is an (updated_at, id) keyset cursor."""
         with session_context() as session:
             query = select(Document).where(Document.collection_id == collection_id)
 
@@ -38,7 +40,10 @@ class DocumentRepository(BaseRepository[Document, DocumentDTO]):
             if search:
                 query = query.where(Document.name.ilike(f"%{search}%"))
 
-            query = query.order_by(Document.updated_at.desc()).offset(offset)
+            if after is not None:
+                query = query.where(tuple_(Document.updated_at, Document.id) < tuple_(*after))
+
+            query = query.order_by(Document.updated_at.desc(), Document.id.desc()).offset(offset)
 
             if limit:
                 query = query.limit(limit)
@@ -87,8 +92,6 @@ class DocumentRepository(BaseRepository[Document, DocumentDTO]):
             return [self.dto_class.from_orm(item) for item in session.scalars(sql)]
 
     def delete_by_id(self, id: str) -> int:
-        from sqlalchemy import delete
-
         with session_context() as session:
             stmt = delete(Document).where(Document.id == id)
             result = session.execute(stmt)
@@ -97,8 +100,6 @@ class DocumentRepository(BaseRepository[Document, DocumentDTO]):
         return result.rowcount or 0
 
     def delete_by_collection(self, id: str) -> int:
-        from sqlalchemy import delete
-
         with session_context() as session:
             stmt = delete(Document).where(Document.collection_id == id)
             result = session.execute(stmt)
@@ -245,8 +246,6 @@ class DocumentChunkRepository(BaseRepository[DocumentChunk, DocumentChunkDTO]):
             ) or 0
 
     def delete_by_document(self, document_id: str) -> int:
-        from sqlalchemy import delete
-
         with session_context() as session:
             stmt = delete(DocumentChunk).where(DocumentChunk.document_id == document_id)
             result = session.execute(stmt)
@@ -255,8 +254,6 @@ class DocumentChunkRepository(BaseRepository[DocumentChunk, DocumentChunkDTO]):
         return result.rowcount or 0
 
     def delete_by_collection(self, collection_id: str) -> int:
-        from sqlalchemy import delete
-
         with session_context() as session:
             stmt = delete(DocumentChunk).where(DocumentChunk.collection_id == collection_id)
             result = session.execute(stmt)
@@ -1,9 +1,9 @@
 """Task and TaskLog repositories."""
 
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Optional
 
-from sqlalchemy import func, select
+from sqlalchemy import delete, func, select
 
 from database.connection import session_context
 from database.models.task import Task, TaskLog
@@ -164,8 +164,6 @@ class TaskRepository(BaseRepository[Task, TaskDTO]):
             return [self.dto_class.from_orm(item) for item in session.scalars(query)]
 
     def delete_by_collection(self, collection_id: str) -> int:
-        from sqlalchemy import delete
-
         with session_context() as session:
             stmt = delete(Task).where(Task.collection_id == collection_id)
             result = session.execute(stmt)
@@ -249,8 +247,6 @@ class TaskLogRepository(BaseRepository[TaskLog, TaskLogDTO]):
             return session.scalar(query) or 0
 
     def delete_by_task(self, task_id: str) -> int:
-        from sqlalchemy import delete
-
         with session_context() as session:
             stmt = delete(TaskLog).where(TaskLog.task_id == task_id)
             result = session.execute(stmt)
@@ -259,10 +255,6 @@ class TaskLogRepository(BaseRepository[TaskLog, TaskLogDTO]):
         return result.rowcount or 0
 
     def delete_old_logs(self, days: int = 30) -> int:
-        from datetime import timedelta
-
-        from sqlalchemy import delete
-
         with session_context() as session:
             cutoff_date = datetime.utcnow() - timedelta(days=days)
 
@@ -5,8 +5,12 @@ AI response generation has been moved to AgentChatService.
 
 import json
 import logging
+from collections.abc import Iterator
 from typing import Optional
 
+import orjson
+
+from cache_util import TTLCache
 from models.dto import ChatDTO, ChatMessageDTO
 from models.responses import ChatMessageResponse, ChatResponse
 from repository.chat import ChatMessageRepository, ChatRepository
@@ -22,6 +26,10 @@ class ChatService:
         self.config = config
         self.chat_repo = ChatRepository()
         self.chat_message_repo = ChatMessageRepository()
+        # Existence checks run before every message read and regenerate. Misses
+        # expire quickly so a 404 is not pinned once the chat shows up
+        self._exists_cache = TTLCache(maxsize=1024, ttl=10.0)
+        self._missing_cache = TTLCache(maxsize=1024, ttl=2.0)
         logger.info("ChatService initialized successfully")
 
     def _to_chat_response(self, chat: ChatDTO) -> ChatResponse:
@@ -31,7 +39,7 @@ class ChatService:
         return ChatResponse(
             chat_id=chat.id,
             name=chat.name,
-            collection_ids=json.loads(chat.collection_ids) if chat.collection_ids else [],
+            collection_ids=orjson.loads(chat.collection_ids) if chat.collection_ids else [],
             bound_collection_id=chat.bound_collection_id,
             message_count=chat.message_count or 0,
             sort_order=chat.sort_order or 0,
@@ -43,13 +51,13 @@ class ChatService:
     def _to_message_response(self, message: ChatMessageDTO) -> ChatMessageResponse:
         """Convert ChatMessage model to response model"""
         try:
-            sources = json.loads(message.sources) if message.sources else []
-        except json.JSONDecodeError:
+            sources = orjson.loads(message.sources) if message.sources else []
+        except orjson.JSONDecodeError:
             sources = []
 
         try:
-            metadata = json.loads(message.message_metadata) if message.message_metadata else {}
-        except json.JSONDecodeError:
+            metadata = orjson.loads(message.message_metadata) if message.message_metadata else {}
+        except orjson.JSONDecodeError:
             metadata = {}
 
         return ChatMessageResponse(
@@ -72,6 +80,7 @@ class ChatService:
             bound_collection_id=bound_collection_id
         ))
         logger.info(f"Created chat {created_chat.id} with name '{name}'")
+        self._missing_cache.pop(created_chat.id)
 
         return self._to_chat_response(created_chat)
 
@@ -84,12 +93,40 @@ class ChatService:
 
         return self._to_chat_response(chat)
 
-    async def list_chats(self, offset: int = 0, limit: int = 50) -> list[ChatResponse]:
-        """List chats with pagination"""
-        chats = self.chat_repo.get_all_ordered(offset=offset, limit=limit)
+    async def chat_exists(self, chat_id: str) -> bool:
+        """Whether the chat exists, answered from a short-lived cache when possible"""
+        if self._exists_cache.get(chat_id):
+            return True
+        if self._missing_cache.get(chat_id):
+            return False
+
+        exists = self.chat_repo.exists(chat_id)
+        (self._exists_cache if exists else self._missing_cache).set(chat_id, True)
+        return exists
+
+    async def list_chats(
+        self,
+        offset: int = 0,
+        limit: int = 50,
+        after: Optional[tuple[int, str]] = None
+    ) -> list[ChatResponse]:
+        """List chats with offset pagination, or keyset pagination past *after*"""
+        if after is not None:
+            chats = self.chat_repo.get_page_after(after, limit)
+        else:
+            chats = self.chat_repo.get_all_ordered(offset=offset, limit=limit)
 
         return [self._to_chat_response(chat) for chat in chats]
 
+    async def list_chats_page(self, offset: int = 0, limit: int = 50) -> tuple[list[ChatResponse], int]:
+        """List a page of chats and the total chat count in one query"""
+        chats, total = self.chat_repo.get_page_with_total(offset=offset, limit=limit)
+        return [self._to_chat_response(chat) for chat in chats], total
+
+    async def count_chats(self) -> int:
+        """Count total chats"""
+        return self.chat_repo.count_all()
+
     async def update_chat(
         self,
         chat_id: str,
@@ -109,8 +146,15 @@ class ChatService:
 
     async def delete_chat(self, chat_id: str) -> bool:
         """Delete chat and all its messages"""
+        self._exists_cache.pop(chat_id)
         self.chat_message_repo.delete_by_chat(chat_id)
-        return self.chat_repo.delete(chat_id)
+        deleted = self.chat_repo.delete(chat_id)
+        # Pop again: a chat_exists() read that started before the delete may
+        # have re-cached the chat in the meantime
+        self._exists_cache.pop(chat_id)
+        if deleted:
+            self._missing_cache.set(chat_id, True)
+        return deleted
 
     async def clear_chat_messages(self, chat_id: str) -> int:
         """Delete all messages in a chat but keep the chat itself."""
@@ -148,6 +192,26 @@ class ChatService:
         messages = self.chat_message_repo.get_by_chat(chat_id, offset=offset, limit=limit)
         return [self._to_message_response(message) for message in messages]
 
+    async def get_chat_messages_page(
+        self,
+        chat_id: str,
+        offset: int = 0,
+        limit: int = 50
+    ) -> tuple[list[ChatMessageResponse], int]:
+        """Get a page of messages and the total message count in one query"""
+        messages, total = self.chat_message_repo.get_page_by_chat(chat_id, offset=offset, limit=limit)
+        return [self._to_message_response(message) for message in messages], total
+
+    def iter_chat_messages(
+        self,
+        chat_id: str,
+        offset: int = 0,
+        limit: Optional[int] = None
+    ) -> Iterator[ChatMessageResponse]:
+        """Iterate over messages for a chat without loading them all (blocking)"""
+        for message in self.chat_message_repo.iter_by_chat(chat_id, offset=offset, limit=limit):
+            yield self._to_message_response(message)
+
     async def count_chat_messages(self, chat_id: str) -> int:
         """Count total chat messages"""
         return self.chat_message_repo.count_by_chat(chat_id)
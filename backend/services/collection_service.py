@@ -2,11 +2,15 @@
 Collection management service.
 """
 
+import asyncio
+import itertools
 import logging
 import shutil
 from pathlib import Path
 from typing import Any, Optional
+from urllib.parse import urlparse
 
+from cache_util import SingleFlight, TTLCache
 from database.connection import transaction
 from models.dto import CollectionDTO
 from models.responses import CollectionResponse
@@ -43,8 +47,49 @@ class CollectionService:
         # LLM service
         self.llm_service = llm_service
 
+        # get_collection is hit by every ingest and task request; concurrent
+        # lookups of one id share a query and the result lives for a second
+        self._collection_cache = TTLCache(maxsize=1024, ttl=1.0)
+        self._collection_flight = SingleFlight()
+        # Ingest only needs to know the collection is there. Only hits are kept,
+        # so a collection created a moment ago is never reported missing
+        self._exists_cache = TTLCache(maxsize=512, ttl=60.0)
+        # Encoded GET responses of the collection routes and their ETags.
+        # Every writer goes through invalidate_collection(); document counts
+        # also move while ingest runs, so entries only live a couple of seconds
+        self._response_cache = TTLCache(maxsize=256, ttl=2.0)
+        self._generations = itertools.count(1)
+        self._response_generation = 0  # bumped on every invalidation
+
         logger.info("CollectionService initialized successfully")
 
+    def get_cached_response(self, key: tuple) -> tuple[Optional[tuple[bytes, str]], int]:
+        """Encoded body and ETag cached for a collection GET, plus the current generation.
+
+        Pass the generation back to :meth:`cache_response` so a read that
+        raced a write is not cached.
+        """
+        return self._response_cache.get(key), self._response_generation
+
+    def cache_response(self, key: tuple, entry: tuple[bytes, str], generation: int) -> None:
+        if generation != self._response_generation:
+            return
+        self._response_cache.set(key, entry)
+        if generation != self._response_generation:
+            # An invalidation landed between the check and the set
+            self._response_cache.pop(key)
+
+    def invalidate_collection(self, collection_id: Optional[str] = None) -> None:
+        """Drop cached reads after a write to *collection_id* (or to any collection).
+
+        Safe to call from the task worker thread.
+        """
+        # next() on a count is atomic, unlike += across threads
+        self._response_generation = next(self._generations)
+        if collection_id is not None:
+            self._collection_cache.pop(collection_id)
+        self._response_cache.clear()
+
     def _to_response(self, collection: CollectionDTO) -> CollectionResponse:
         """Convert Collection model to response model"""
         current_version = compute_index_version()
@@ -88,6 +133,7 @@ class CollectionService:
         # Create ChromaDB collection
         await self.chroma_manager.ensure_collection(collection_id)
 
+        self.invalidate_collection()
         logger.info(f"Created collection '{collection_id}' with name '{name}'")
         return self._to_response(created_collection)
 
@@ -104,12 +150,33 @@ class CollectionService:
 
     async def get_collection(self, collection_id: str) -> Optional[CollectionResponse]:
         """Get collection by ID with updated stats"""
-        collection = self.collection_repo.get_by_id(collection_id)
+        cached = self._collection_cache.get(collection_id)
+        if cached is not None:
+            return cached
+        return await self._collection_flight.do(collection_id, lambda: self._load_collection(collection_id))
+
+    async def _load_collection(self, collection_id: str) -> Optional[CollectionResponse]:
+        collection = await asyncio.to_thread(self.collection_repo.get_by_id, collection_id)
 
         if not collection:
             return None
 
-        return self._to_response(collection)
+        response = self._to_response(collection)
+        self._collection_cache.set(collection_id, response)
+        return response
+
+    async def collection_exists(self, collection_id: str) -> bool:
+        """Whether the collection exists, answered from cache for recently seen ids"""
+        if self._exists_cache.get(collection_id):
+            return True
+        exists = await asyncio.to_thread(self.collection_repo.exists, collection_id)
+        if exists:
+            self._exists_cache.set(collection_id, True)
+        return exists
+
+    async def get_existing_collection_ids(self, collection_ids: list[str]) -> set[str]:
+        """Return the IDs among *collection_ids* that exist"""
+        return self.collection_repo.get_existing_ids(collection_ids)
 
     async def update_collection(self, collection_id: str, name: Optional[str] = None, description: Optional[str] = None) -> Optional[CollectionResponse]:
         """Update collection"""
@@ -118,20 +185,36 @@ class CollectionService:
             name=name,
             description=description
         ))
+        self.invalidate_collection(collection_id)
         logger.info(f"Updated collection '{collection_id}'")
 
         assert updated_collection is not None
         return self._to_response(updated_collection)
 
-    async def delete_collection(self, collection_id: str):
-        """Delete a collection and all associated data including crawl cache."""
-        # Get domain info before deleting docs (for crawl cache cleanup)
-        docs = self.doc_repo.get_by_collection(collection_id)
+    def _crawl_cache_domains(self, collection_id: str) -> set[str]:
+        """Crawl cache directory names used by the collection's web documents"""
         domains = set()
-        for doc in docs:
+        for doc in self.doc_repo.get_by_collection(collection_id):
             if doc.uri and doc.uri.startswith("http"):
-                from urllib.parse import urlparse
                 domains.add(urlparse(doc.uri).netloc.lower().replace(":", "_"))
+        return domains
+
+    def remove_crawl_cache(self, domains: set[str]) -> None:
+        """Delete crawl cache directories (blocking; may touch many files)"""
+        cache_root = Path(self.config.get_crawl_cache_dir())
+        for domain in domains:
+            domain_dir = cache_root / domain
+            if domain_dir.exists():
+                shutil.rmtree(domain_dir)
+                logger.info(f"Deleted crawl cache: {domain_dir}")
+
+    async def delete_collection(self, collection_id: str) -> set[str]:
+        """Delete a collection and all associated data.
+
+        Returns the crawl cache domains left to clean up with remove_crawl_cache.
+        """
+        # Get domain info before deleting docs (for crawl cache cleanup)
+        domains = self._crawl_cache_domains(collection_id)
 
         # Delete all database records in transaction
         async with transaction():
@@ -141,18 +224,16 @@ class CollectionService:
             self.collection_repo.delete(collection_id)
             await self.chroma_manager.delete_collection(collection_id)
 
-        # Delete crawl cache
-        cache_root = Path(self.config.get_crawl_cache_dir())
-        for domain in domains:
-            domain_dir = cache_root / domain
-            if domain_dir.exists():
-                shutil.rmtree(domain_dir)
-                logger.info(f"Deleted crawl cache: {domain_dir}")
-
+        self.invalidate_collection(collection_id)
+        self._exists_cache.pop(collection_id)
         logger.info(f"Deleted collection '{collection_id}'")
+        return domains
+
+    async def clear_collection(self, collection_id: str) -> set[str]:
+        """Clear all data in a collection but keep the collection itself.
 
-    async def clear_collection(self, collection_id: str):
-        """Clear all data in a collection but keep the collection itself."""
+        Returns the crawl cache domains left to clean up with remove_crawl_cache.
+        """
         collection = self.collection_repo.get_by_id(collection_id)
         if not collection:
             raise ValueError(f"Collection '{collection_id}' not found")
@@ -164,12 +245,7 @@ class CollectionService:
                 self.task_repo.update_status(task.id, "stopped")
 
         # Get domain info before deleting docs (for crawl cache cleanup)
-        docs = self.doc_repo.get_by_collection(collection_id)
-        domains = set()
-        for doc in docs:
-            if doc.uri and doc.uri.startswith("http"):
-                from urllib.parse import urlparse
-                domains.add(urlparse(doc.uri).netloc.lower().replace(":", "_"))
+        domains = self._crawl_cache_domains(collection_id)
 
         # Delete all vectors from ChromaDB
         chroma_collection = await self.chroma_manager.get_collection(collection_id)
@@ -195,15 +271,9 @@ class CollectionService:
                 vector_count=0,
             )
 
-        # Delete crawl cache
-        cache_root = Path(self.config.get_crawl_cache_dir())
-        for domain in domains:
-            domain_dir = cache_root / domain
-            if domain_dir.exists():
-                shutil.rmtree(domain_dir)
-                logger.info(f"Deleted crawl cache: {domain_dir}")
-
+        self.invalidate_collection(collection_id)
         logger.info(f"Cleared collection '{collection_id}'")
+        return domains
 
     async def get_readme(self, collection_id: str) -> tuple[Optional[str], Optional[str], Optional[str], Optional[str], Optional[str]]:
         """Get the AI-generated README content and categories for a collection.
@@ -242,6 +312,7 @@ class CollectionService:
         if source_language:
             update_data["source_language"] = source_language
         self.collection_repo.update(collection_id, **update_data)
+        self.invalidate_collection(collection_id)
 
     async def refresh_collection_summary(self, collection_id: str):
         docs = self.doc_repo.get_by_collection(collection_id, exclude_statuses=["not_found"])
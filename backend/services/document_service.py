@@ -4,6 +4,7 @@ Document processing service for handling files and web content.
 
 import logging
 import mimetypes
+from datetime import datetime
 from typing import Any, Optional
 
 from fastapi import Response
@@ -125,9 +126,15 @@ class DocumentService:
         page_size: int = 50,
         search: Optional[str] = None,
         status: Optional[str] = None,
+        after: Optional[tuple[datetime, str]] = None,
+        include_total: bool = True,
     ) -> ListDocumentsResponse:
-        """List documents in a collection with pagination and filters"""
-        offset = (page - 1) * page_size
+        """List documents in a collection with pagination and filters
+
+        With *after* set, the page is read by keyset from that
+        (updated_at, id) position instead of by page number.
+        """
+        offset = (page - 1) * page_size if after is None else 0
 
         # Get documents (hide not_found pages by default)
         documents = self.doc_repo.get_by_collection(
@@ -137,15 +144,18 @@ class DocumentService:
             search=search,
             offset=offset,
             limit=page_size,
+            after=after,
         )
 
         # Get total count (hide not_found pages by default)
-        total = self.doc_repo.count_by_collection(
-            collection_id=collection_id,
-            status=status,
-            exclude_statuses=["not_found"] if not status else None,
-            search=search,
-        )
+        total = None
+        if include_total:
+            total = self.doc_repo.count_by_collection(
+                collection_id=collection_id,
+                status=status,
+                exclude_statuses=["not_found"] if not status else None,
+                search=search,
+            )
 
         return ListDocumentsResponse(
             documents=[self._to_response(doc) for doc in documents],
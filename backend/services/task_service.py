@@ -15,13 +15,14 @@ from dataclasses import asdict, dataclass
 from pathlib import Path
 from typing import Any, Optional
 
+import orjson
 from langchain_core.output_parsers import StrOutputParser
 
 from crawler.manifest_store import ManifestStore, _domain_key
 from crawler.simple_web_crawler import SimpleCrawlResult, create_simple_web_crawler
 from data_processing.file_processor import create_file_processor
 from data_processing.text_splitter import create_document_processor
-from database.connection import transaction
+from database.connection import session_context, transaction
 from exception import HTTPNotFoundException
 from models.dto import DocumentChunkDTO, DocumentDTO, TaskDTO, TaskLogDTO
 from models.responses import TaskResponse
@@ -49,6 +50,13 @@ class UrlTaskStats:
 class TaskService:
     """Service for managing async tasks"""
 
+    # Task streams wake on writes signalled by _notify(); the fallback poll
+    # covers writes made by another process (e.g. a second uvicorn worker)
+    STREAM_FALLBACK_INTERVAL = 5.0
+    STREAM_MIN_INTERVAL = 0.25
+    STREAM_LOG_BATCH = 100
+    STREAM_LOGS_PER_FRAME = 64
+
     def __init__(self, config, collection_service: CollectionService, llm_service: LLMService,
                  document_index=None, keyword_index=None):
         """Initialize task service"""
@@ -62,12 +70,15 @@ class TaskService:
         self.task_queue: queue.Queue = queue.Queue(maxsize=100)
         self.executor = ThreadPoolExecutor(max_workers=5)
         self.running = False
+        self._num_workers = 1
+        self._batch_size = 1
         self._stop_flags: set[str] = set()  # Task IDs marked for stopping
 
         # Per-task lifecycle tracking (written by worker thread, read by API thread)
         self._worker_loop: asyncio.AbstractEventLoop | None = None  # shared worker event loop
         self._task_events: dict[str, asyncio.Event] = {}            # task_id -> cancel event
         self._active_tasks: dict[str, asyncio.Task] = {}            # task_id -> running asyncio task
+        self._stream_watchers: dict[str, set[tuple[asyncio.AbstractEventLoop, asyncio.Event]]] = {}
         self._task_lock = threading.Lock()  # guards the dicts above
 
         # Initialize repositories
@@ -96,6 +107,36 @@ class TaskService:
             return True
         return task_id in self._stop_flags
 
+    def _watch_task(self, task_id: str) -> tuple[asyncio.AbstractEventLoop, asyncio.Event]:
+        """Register a wakeup event for a stream following *task_id*."""
+        watcher = (asyncio.get_running_loop(), asyncio.Event())
+        with self._task_lock:
+            self._stream_watchers.setdefault(task_id, set()).add(watcher)
+        return watcher
+
+    def _unwatch_task(self, task_id: str, watcher: tuple[asyncio.AbstractEventLoop, asyncio.Event]) -> None:
+        with self._task_lock:
+            watchers = self._stream_watchers.get(task_id)
+            if watchers is not None:
+                watchers.discard(watcher)
+                if not watchers:
+                    del self._stream_watchers[task_id]
+
+    def _notify(self, task_id: str) -> None:
+        """Wake streams following *task_id* after a status, progress or log write.
+
+        Writers run on the worker thread, so the event is set on the loop
+        that owns it.
+        """
+        with self._task_lock:
+            watchers = list(self._stream_watchers.get(task_id, ()))
+        for loop, event in watchers:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # The stream's loop has already shut down
+                pass
+
     async def _apply_stop(self, task_id: str, pending_tasks: list[asyncio.Task] | None = None):
         """Centralised stop handling: cancel pending async tasks, cleanup tracking state."""
         if pending_tasks:
@@ -157,6 +198,7 @@ class TaskService:
 
     def _log_task(self, task_id: str, level: str, message: str):
         self.task_log_repo.add_log(task_id, level, message, None)
+        self._notify(task_id)
         logger.log(getattr(logging, level.upper()), message, exc_info=(level == "error"))
 
     async def _generate_task_title(
@@ -273,6 +315,15 @@ class TaskService:
     async def get_task_logs(self, task_id: str, limit: int | None = None, offset: int = 0) -> list[TaskLogDTO]:
         return self.task_log_repo.list_by_task(task_id=task_id, limit=limit, offset=offset)
 
+    def get_task_and_logs(
+        self, task_id: str, offset: int = 0, limit: int | None = None
+    ) -> tuple[Optional[TaskDTO], list[TaskLogDTO]]:
+        """Read a task and its next page of logs on one session and connection"""
+        with session_context():
+            task = self.task_repo.get_by_id(task_id)
+            logs = self.task_log_repo.list_by_task(task_id, limit=limit, offset=offset)
+        return task, logs
+
     async def stop_task(self, task_id: str) -> bool:
         """Stop a running task. Returns immediately; worker cleans up in background."""
         task = self.task_repo.get_by_id(task_id)
@@ -296,6 +347,7 @@ class TaskService:
 
         # Immediately mark as stopped so the UI reflects the change right away
         self.task_repo.update_status(task_id, "stopped")
+        self._notify(task_id)
         self._log_info_task(task_id, "任务已停止")
         return True
 
@@ -378,6 +430,7 @@ class TaskService:
                     source_language=None,
                 )
 
+        self.collection_service.invalidate_collection(collection_id)
         logger.info(f"Cleaned up task {task_id}")
         return True
 
@@ -438,6 +491,8 @@ class TaskService:
         self.task_log_repo.delete_by_task(task_id)
         self.task_repo.delete(task_id)
 
+        if cleanup_resources and collection_id:
+            self.collection_service.invalidate_collection(collection_id)
         logger.info(f"Deleted task {task_id} (cleanup_resources={cleanup_resources})")
         return True
 
@@ -460,84 +515,90 @@ class TaskService:
                     logger.info(f"Deleted crawl cache subdir: {target}")
 
     async def get_task_stream_generator(self, task_id: str):
-        task = self.task_repo.get_by_id(task_id)
+        """Yield ``(event, data)`` pairs for a task's SSE stream, ``data`` being JSON bytes."""
+        # Repository calls are blocking; keep them off the event loop that
+        # serves every other stream
+        task = await asyncio.to_thread(self.task_repo.get_by_id, task_id)
         if not task:
             raise HTTPNotFoundException(f"Task {task_id} not found")
 
         # Send initial metadata
-        yield {
-            "event": "metadata",
-            "data": json.dumps({
-                "task_id": task_id,
-                "type": task.type,
-                "collection_id": task.collection_id
-            })
-        }
+        yield "metadata", orjson.dumps({
+            "task_id": task_id,
+            "type": task.type,
+            "collection_id": task.collection_id
+        })
 
         last_progress = -1
         offset = 0
-        while True:
-            # Get current task status
-            current_task = self.task_repo.get_by_id(task_id)
-            task_logs = self.task_log_repo.list_by_task(task_id, limit=100, offset=offset)
-            assert current_task
-
-            # Send progress update if changed
-            current_progress = current_task.progress_percentage or 0
-            if current_progress != last_progress:
-                yield {
-                    "event": "progress",
-                    "data": json.dumps({
+        watcher = self._watch_task(task_id)
+        _, changed = watcher
+        try:
+            while True:
+                # Get current task status
+                current_task, task_logs = await asyncio.to_thread(
+                    self.get_task_and_logs, task_id, offset=offset, limit=self.STREAM_LOG_BATCH
+                )
+                assert current_task
+
+                # Send progress update if changed
+                current_progress = current_task.progress_percentage or 0
+                if current_progress != last_progress:
+                    yield "progress", orjson.dumps({
                         "percentage": current_progress,
                         "stats": current_task.stats
                     })
-                }
-                last_progress = current_progress
-
-            # send task logs
-            for log in task_logs:
-                yield {
-                    "event": "log",
-                    "data": json.dumps({
-                        "level": log.level,
-                        "message": log.message,
-                        "timestamp": log.timestamp.isoformat() if log.timestamp else None,
-                        "details": json.loads(log.details) if log.details else {}
-                    })
-                }
-            offset += len(task_logs)
-
-            # check if task is completed
-            if current_task.status == "success":
-                yield {
-                    "event": "done",
-                    "data": json.dumps({
+                    last_progress = current_progress
+
+                # send task logs, several per frame; details is stored as JSON
+                # text, so it is spliced in as-is rather than parsed and re-encoded
+                for start in range(0, len(task_logs), self.STREAM_LOGS_PER_FRAME):
+                    batch = [
+                        {
+                            "level": log.level,
+                            "message": log.message,
+                            "timestamp": log.timestamp.isoformat() if log.timestamp else None,
+                            "details": orjson.Fragment(log.details) if log.details else {}
+                        }
+                        for log in task_logs[start:start + self.STREAM_LOGS_PER_FRAME]
+                    ]
+                    yield "logs", orjson.dumps(batch)
+                offset += len(task_logs)
+
+                # check if task is completed
+                if current_task.status == "success":
+                    yield "done", orjson.dumps({
                         "duration_ms": None  # Could calculate if needed
                     })
-                }
-                break
-            elif current_task.status == "failed":
-                yield {
-                    "event": "error",
-                    "data": json.dumps({
+                    break
+                elif current_task.status == "failed":
+                    yield "error", orjson.dumps({
                         "message": current_task.error_message
                     })
-                }
-                break
-            elif current_task.status == "stopped":
-                yield {
-                    "event": "stopped",
-                    "data": json.dumps({})
-                }
-                break
-
-            # Wait before next check
-            await asyncio.sleep(1.0)
+                    break
+                elif current_task.status == "stopped":
+                    yield "stopped", b"{}"
+                    break
+
+                # Drain a log backlog straight away, otherwise sleep until the
+                # worker signals a write or the fallback interval passes
+                if len(task_logs) < self.STREAM_LOG_BATCH:
+                    try:
+                        await asyncio.wait_for(changed.wait(), timeout=self.STREAM_FALLBACK_INTERVAL)
+                    except asyncio.TimeoutError:
+                        pass
+                    changed.clear()
+                # Bound the query rate while a task is logging in bursts
+                await asyncio.sleep(self.STREAM_MIN_INTERVAL)
+        finally:
+            self._unwatch_task(task_id, watcher)
 
     async def update_file_task_progress(self, task_id: str, stats: FileTaskStats) -> bool:
         stats_json = json.dumps(asdict(stats))
         progress = stats.files_processed * 100 // stats.files_total if stats.files_total > 0 else 0
-        return self.task_repo.update_progress(task_id, progress, stats_json)
+        updated = self.task_repo.update_progress(task_id, progress, stats_json)
+        self._notify(task_id)
+        return updated
 
     def update_url_task_progress(self, task_id: str, stats: UrlTaskStats) -> bool:
         stats_json = json.dumps(asdict(stats))
@@ -556,7 +617,9 @@ class TaskService:
         elif stats.phase == "readme":
             progress = 85
 
-        return self.task_repo.update_progress(task_id, progress, stats_json)
+        updated = self.task_repo.update_progress(task_id, progress, stats_json)
+        self._notify(task_id)
+        return updated
 
     async def requeue_processing_task(self):
         tasks = self.task_repo.get_active_tasks()
@@ -564,13 +627,21 @@ class TaskService:
             self.task_queue.put(task.id)
             logger.info(f"Re-queued processing task {task.id}")
 
-    async def start_workers(self):
-        """Start background task workers"""
+    async def start_workers(self, num_workers: int = 1, batch_size: int = 1):
+        """Start background task workers
+
+        Args:
+            num_workers: Number of queue consumers running on the worker event loop.
+            batch_size: Max task ids a consumer takes from the queue per round trip;
+                they are processed concurrently.
+        """
         if self.running:
             logger.warning("Workers already running")
             return
 
         self.running = True
+        self._num_workers = max(1, num_workers)
+        self._batch_size = max(1, batch_size)
         # Re-queue any pending/processing tasks from previous sessions
         await self.requeue_processing_task()
         self.executor.submit(self._sync_worker, "Task_queue_worker")
@@ -583,8 +654,8 @@ class TaskService:
         logger.info("Stopping task workers...")
         self.running = False
 
-        # Cancel all workers
-        self.executor.shutdown(wait=True)
+        # Wait for the worker thread off the event loop so other shutdown steps can proceed
+        await asyncio.to_thread(self.executor.shutdown, wait=True)
 
         logger.info("Task workers stopped")
 
@@ -596,15 +667,26 @@ class TaskService:
         # 确保在新线程中日志配置也正确
         configure_logging(get_config())
 
-        # 重新获取 logger 以确保使用最新配置
-        global logger
-        import logging
-        logger = logging.getLogger(__name__)
-
         logger.info(f"Sync worker {worker_name} starting")
         asyncio.run(self._worker(worker_name))
 
     async def _worker(self, worker_name: str):
+        """Run the queue consumers on this thread's event loop"""
+        await asyncio.gather(*(
+            self._consume_queue(f"{worker_name}-{i}") for i in range(self._num_workers)
+        ))
+
+    def _take_batch(self) -> list[str]:
+        """Block (up to 1s) for one task id, then drain up to batch_size without waiting"""
+        batch = [self.task_queue.get(timeout=1.0)]
+        while len(batch) < self._batch_size:
+            try:
+                batch.append(self.task_queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    async def _consume_queue(self, worker_name: str):
         """Background worker that processes tasks from queue"""
         logger.info(f"Task worker {worker_name} started")
 
@@ -612,19 +694,20 @@ class TaskService:
             try:
                 # queue.Queue.get is blocking; use to_thread to avoid blocking the event loop
                 try:
-                    task_id = await asyncio.to_thread(
-                        self.task_queue.get, timeout=1.0
-                    )
+                    task_ids = await asyncio.to_thread(self._take_batch)
                 except queue.Empty:
                     continue
 
-                logger.info(f"Worker {worker_name} processing task {task_id}")
+                logger.info(f"Worker {worker_name} processing tasks {task_ids}")
 
-                # Process the task
-                await self._process_task_with_exception(task_id)
+                # Process the batch
+                await asyncio.gather(*(
+                    self._process_task_with_exception(task_id) for task_id in task_ids
+                ))
 
-                # Mark task as done in queue
-                self.task_queue.task_done()
+                # Mark tasks as done in queue
+                for _ in task_ids:
+                    self.task_queue.task_done()
 
             except asyncio.CancelledError:
                 logger.info(f"Worker {worker_name} cancelled")
@@ -643,12 +726,15 @@ class TaskService:
             current = self.task_repo.get_by_id(task_id)
             if not current or current.status != "stopped":
                 self.task_repo.update_status(task_id, "stopped")
+                self._notify(task_id)
         except LLMConsecutiveFailureError as e:
             logger.error(f"Task {task_id} aborted: {e}")
             self.task_repo.mark_completed(task_id, success=False, error_message=str(e))
+            self._notify(task_id)
         except Exception as e:
             logger.error(f"Error processing task {task_id}: {e}", exc_info=True)
             self.task_repo.mark_completed(task_id, success=False, error_message=str(e))
+            self._notify(task_id)
 
     async def _process_task(self, task_id: str):
         """Process a single task — owns the per-task lifecycle state."""
@@ -677,6 +763,7 @@ class TaskService:
             self._active_tasks[task_id] = asyncio.current_task()  # type: ignore[assignment]
 
         self.task_repo.mark_started(task_id)
+        self._notify(task_id)
 
         try:
             assert task.input_params
@@ -697,8 +784,13 @@ class TaskService:
                 error_msg = f"Unknown task type: {task.type}"
                 logger.error(error_msg)
                 self.task_repo.mark_completed(task_id, False, error_msg)
+                self._notify(task_id)
                 return
 
+            # Counts, README and categories have moved; don't wait for the
+            # summary refresh below before serving them fresh
+            self.collection_service.invalidate_collection(task.collection_id)
+
             # Final stop check
             if self._check_task_cancelled(task_id):
                 await self._apply_stop(task_id)
@@ -715,6 +807,8 @@ class TaskService:
             with self._task_lock:
                 self._task_events.pop(task_id, None)
                 self._active_tasks.pop(task_id, None)
+            # Failed and stopped tasks may have written documents too
+            self.collection_service.invalidate_collection(task.collection_id)
 
     async def _check_document_exists(self, collection_id: str, uri: str) -> bool:
         """Check if document already exists and handle duplication logic"""
@@ -928,6 +1022,7 @@ class TaskService:
                 completed += 1
                 progress = int(completed / total * 100)
                 self.task_repo.update_progress(task_id, progress)
+                self._notify(task_id)
                 self._log_info_task(task_id, f"Re-indexed ({completed}/{total}): {title}")
 
             except Exception as e:
@@ -983,6 +1078,7 @@ class TaskService:
                 await self.update_file_task_progress(task_id, stats)
 
         self.task_repo.mark_completed(task_id, True)
+        self._notify(task_id)
         self._log_info_task(task_id, "File ingestion completed")
 
     async def _process_single_file(self, task_id: str, collection_id: str, file_path: str, override: bool = True):
@@ -1327,7 +1423,9 @@ class TaskService:
         )
 
         self.task_repo.update_progress(task_id, 100)
+        self._notify(task_id)
         self.task_repo.mark_completed(task_id, True)
+        self._notify(task_id)
         self._log_info_task(task_id, "URL ingestion completed")
 
     async def _process_single_page(
@@ -2353,6 +2451,7 @@ Return ONLY a JSON array in this exact format:
         await self._generate_readme(task_id, collection_id, stats)
 
         self.task_repo.mark_completed(task_id, True)
+        self._notify(task_id)
         self._log_info_task(task_id, "README regeneration completed")
 
     async def _process_recategorize(
@@ -2377,6 +2476,7 @@ Return ONLY a JSON array in this exact format:
         )
 
         self.task_repo.mark_completed(task_id, True)
+        self._notify(task_id)
         self._log_info_task(task_id, "Recategorization completed")
 
     def close(self):
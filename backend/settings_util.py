@@ -7,16 +7,22 @@ Sensitive values (API keys) are encrypted at rest using AES (Fernet).
 import base64
 import hashlib
 import logging
+from collections.abc import Iterable
 from typing import Any, Optional
 
 from cryptography.fernet import Fernet, InvalidToken
 from sqlalchemy import select
 
+from cache_util import TTLCache
 from database.connection import session_context
 from database.models.settings import Settings
 
 logger = logging.getLogger(__name__)
 
+# Decrypted settings rows, read on every settings page open; cleared on
+# writes here, the TTL bounds staleness from writes in other workers
+_settings_cache = TTLCache(maxsize=1, ttl=30.0)
+
 # ---------------------------------------------------------------------------
 # Encryption helpers
 # ---------------------------------------------------------------------------
@@ -123,6 +129,18 @@ def set_setting(
                 row.description = description
             row.is_sensitive = is_sensitive
         session.flush()
+    _settings_cache.clear()
+
+
+def set_settings(items: Iterable[dict[str, Any]]) -> None:
+    """Insert or update several settings in a single transaction.
+
+    Each item holds the keyword arguments of :func:`set_setting`.
+    """
+    with session_context():
+        for item in items:
+            set_setting(**item)
+    _settings_cache.clear()
 
 
 def delete_setting(key: str) -> bool:
@@ -133,7 +151,8 @@ def delete_setting(key: str) -> bool:
             return False
         session.delete(row)
         session.flush()
-        return True
+    _settings_cache.clear()
+    return True
 
 
 def list_settings(category: Optional[str] = None) -> list[dict[str, Any]]:
@@ -141,11 +160,23 @@ def list_settings(category: Optional[str] = None) -> list[dict[str, Any]]:
 
     Sensitive values are decrypted and returned in plaintext.
     """
+    cached = _settings_cache.get("all")
+    if cached is None:
+        rows = _load_settings()
+        by_category: dict[str, list[dict[str, Any]]] = {}
+        for row in rows:
+            by_category.setdefault(row["category"], []).append(row)
+        cached = (rows, by_category)
+        _settings_cache.set("all", cached)
+    rows, by_category = cached
+    if category:
+        return list(by_category.get(category, ()))
+    return list(rows)
+
+
+def _load_settings() -> list[dict[str, Any]]:
     with session_context() as session:
-        query = select(Settings)
-        if category:
-            query = query.where(Settings.category == category)
-        query = query.order_by(Settings.category, Settings.key)
+        query = select(Settings).order_by(Settings.category, Settings.key)
 
         results = []
         for row in session.scalars(query):
@@ -1,10 +1,13 @@
 """Tests for AgentChatService."""
 
+import asyncio
 import json
+import threading
 from unittest.mock import MagicMock
 
 from chat.agent.llm.base import AssistantTurn, ToolCallingBackend, Usage
 from chat.agent.runtime import AgentConfig
+from chat import agent_service
 from chat.agent_service import AgentChatService
 from chat.models import SSEEventType
 from models.dto import ChatDTO, ChatMessageDTO
@@ -190,6 +193,57 @@ class TestProcessNormalFlow:
         assert first["type"] == "agent_start"
 
 
+class TestProcessCancellation:
+    async def test_cancel_during_start_turn_drops_placeholder(self, tmp_path):
+        config = AgentConfig(
+            max_iterations=3,
+            transcript_dir=str(tmp_path / "transcripts"),
+        )
+        chat_repo = _make_chat_repo("chat-1")
+        message_repo = _make_message_repo()
+        entered = threading.Event()
+        release = threading.Event()
+        add_message = message_repo.add_message.side_effect
+
+        def _blocking_add_message(chat_id, role, content, sources=None, metadata=None):
+            if role == "assistant":
+                entered.set()
+                release.wait(timeout=5)
+            return add_message(chat_id, role, content, sources, metadata)
+
+        message_repo.add_message.side_effect = _blocking_add_message
+        service = AgentChatService(
+            backend=_FakeBackend(),
+            config=config,
+            chat_repo=chat_repo,
+            chat_message_repo=message_repo,
+            document_repo=_make_document_repo(),
+            collection_repo=_make_collection_repo(),
+        )
+
+        async def _consume():
+            async for _ in service.process(chat_id="chat-1", query="hi"):
+                pass
+
+        task = asyncio.create_task(_consume())
+        assert await asyncio.to_thread(entered.wait, 5)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        assert agent_service._cancel_registry == {}
+        message_repo.delete.assert_not_called()
+
+        # _start_turn commits after the cancel; its placeholder is still dropped
+        release.set()
+        for _ in range(100):
+            if message_repo.delete.called:
+                break
+            await asyncio.sleep(0.01)
+        message_repo.delete.assert_called_once_with("msg_assistant_chat-1")
+
+
 class TestLoadHistory:
     def test_loads_only_agent_engine_messages(self):
         messages = [
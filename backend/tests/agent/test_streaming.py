@@ -0,0 +1,87 @@
+"""Tests for SSE thinking-delta coalescing."""
+
+import asyncio
+
+import pytest
+
+from chat.agent.streaming import coalesce_thinking
+from chat.models import SSEEvent, SSEEventType
+
+
+def _thinking(delta: str, iteration: int = 1) -> SSEEvent:
+    return SSEEvent(type=SSEEventType.AGENT_THINKING, data={"delta": delta, "iteration": iteration})
+
+
+async def _source(events, delay: float = 0.0):
+    for event in events:
+        if delay:
+            await asyncio.sleep(delay)
+        yield event
+
+
+async def _collect(stream) -> list[SSEEvent]:
+    return [event async for event in stream]
+
+
+class TestCoalesceThinking:
+    async def test_merges_consecutive_deltas(self):
+        events = [_thinking(c) for c in "hello"]
+        out = await _collect(coalesce_thinking(_source(events), max_chars=64, max_delay=1.0))
+        assert [(e.type, e.data) for e in out] == [
+            (SSEEventType.AGENT_THINKING, {"delta": "hello", "iteration": 1}),
+        ]
+
+    async def test_flushes_before_other_events(self):
+        done = SSEEvent(type=SSEEventType.THINKING_DONE, data={"iteration": 1, "ms": 5})
+        events = [_thinking("a"), _thinking("b"), done, _thinking("c", iteration=2)]
+        out = await _collect(coalesce_thinking(_source(events), max_chars=64, max_delay=1.0))
+        assert [e.data for e in out] == [
+            {"delta": "ab", "iteration": 1},
+            {"iteration": 1, "ms": 5},
+            {"delta": "c", "iteration": 2},
+        ]
+
+    async def test_does_not_merge_across_iterations(self):
+        events = [_thinking("a", iteration=1), _thinking("b", iteration=-1)]
+        out = await _collect(coalesce_thinking(_source(events), max_chars=64, max_delay=1.0))
+        assert [e.data["iteration"] for e in out] == [1, -1]
+
+    async def test_flushes_at_size_limit(self):
+        events = [_thinking("ab") for _ in range(5)]
+        out = await _collect(coalesce_thinking(_source(events), max_chars=4, max_delay=1.0))
+        assert [e.data["delta"] for e in out] == ["abab", "abab", "ab"]
+
+    async def test_flushes_when_window_closes(self):
+        events = [_thinking("a"), _thinking("b")]
+        out = await _collect(coalesce_thinking(_source(events, delay=0.05), max_chars=64, max_delay=0.01))
+        assert [e.data["delta"] for e in out] == ["a", "b"]
+
+    async def test_disabled(self):
+        events = [_thinking(c) for c in "abc"]
+        out = await _collect(coalesce_thinking(_source(events), max_chars=1))
+        assert [e.data["delta"] for e in out] == ["a", "b", "c"]
+
+    async def test_source_errors_propagate(self):
+        async def failing():
+            yield _thinking("a")
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            await _collect(coalesce_thinking(failing(), max_chars=64, max_delay=1.0))
+
+    async def test_close_cancels_source(self):
+        cancelled = asyncio.Event()
+
+        async def slow():
+            yield _thinking("a")
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            yield _thinking("b")
+
+        stream = coalesce_thinking(slow(), max_chars=64, max_delay=0.01)
+        assert (await stream.__anext__()).data["delta"] == "a"
+        await stream.aclose()
+        assert cancelled.is_set()
@@ -0,0 +1,120 @@
+"""Tests for the in-process caches and ETag helpers."""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from api.etag import compute_etag, json_etag_response
+from api.middleware import UnifiedResponseMiddleware
+from cache_util import SingleFlight, TTLCache
+
+
+class TestTTLCache:
+    def test_get_set(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+        assert cache.get("missing", "default") == "default"
+
+    def test_expiry(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr("cache_util.time.monotonic", lambda: now[0])
+        cache = TTLCache(ttl=5)
+        cache.set("a", 1)
+        now[0] += 4.9
+        assert cache.get("a") == 1
+        now[0] += 0.2
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_lru_eviction(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+    def test_pop_and_clear(self):
+        cache = TTLCache()
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.pop("a")
+        cache.pop("missing")
+        assert cache.get("a") is None
+        cache.clear()
+        assert len(cache) == 0
+
+
+class TestETag:
+    def _client(self) -> TestClient:
+        app = FastAPI()
+        app.add_middleware(UnifiedResponseMiddleware)
+
+        @app.get("/items")
+        async def items(request: Request):
+            return json_etag_response(request, b'{"items":[1]}')
+
+        return TestClient(app)
+
+    def test_sets_etag_and_wraps_body(self):
+        resp = self._client().get("/items")
+        assert resp.status_code == 200
+        assert resp.headers["etag"] == "W/" + compute_etag(b'{"items":[1]}')
+        assert resp.json()["data"] == {"items": [1]}
+
+    def test_not_modified(self):
+        etag = compute_etag(b'{"items":[1]}')
+        client = self._client()
+        resp = client.get("/items", headers={"If-None-Match": f'"other", W/{etag}'})
+        assert resp.status_code == 304
+        assert resp.content == b""
+        assert client.get("/items", headers={"If-None-Match": '"other"'}).status_code == 200
+
+
+class TestSingleFlight:
+    async def test_concurrent_calls_share_one_load(self):
+        flight = SingleFlight()
+        calls = 0
+
+        async def load():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "value"
+
+        results = await asyncio.gather(*(flight.do("k", load) for _ in range(5)))
+        assert results == ["value"] * 5
+        assert calls == 1
+        # Finished loads are not remembered
+        assert await flight.do("k", load) == "value"
+        assert calls == 2
+
+    async def test_errors_reach_every_caller(self):
+        flight = SingleFlight()
+
+        async def load():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+
+        results = await asyncio.gather(flight.do("k", load), flight.do("k", load), return_exceptions=True)
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        flight = SingleFlight()
+
+        async def load():
+            await asyncio.sleep(0.02)
+            return 1
+
+        first = asyncio.ensure_future(flight.do("k", load))
+        second = asyncio.ensure_future(flight.do("k", load))
+        await asyncio.sleep(0)
+        first.cancel()
+        assert await second == 1
+        with pytest.raises(asyncio.CancelledError):
+            await first
@@ -0,0 +1,47 @@
+"""Tests for the message trace route."""
+
+from unittest.mock import MagicMock
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.middleware import UnifiedResponseMiddleware, register_exception_handlers
+from api.routes import chats_trace
+from api.state import AppState, set_app_state
+from models.dto import ChatMessageDTO
+
+
+def _client(message: ChatMessageDTO | None) -> TestClient:
+    app = FastAPI()
+    register_exception_handlers(app)
+    app.add_middleware(UnifiedResponseMiddleware)
+    app.include_router(chats_trace.router)
+
+    chat_service = MagicMock()
+    chat_service.chat_message_repo.get_by_id.return_value = message
+    # A real AppState, so the provider is resolved against its actual fields
+    set_app_state(app, AppState(
+        chat_service=chat_service,
+        document_service=MagicMock(),
+        collection_service=MagicMock(),
+        task_service=MagicMock(),
+    ))
+    return TestClient(app)
+
+
+class TestMessageTrace:
+    def test_returns_agent_trace(self):
+        message = ChatMessageDTO(id="m", chat_id="c", message_metadata='{"agent_trace": {"steps": [1]}}')
+        resp = _client(message).get("/chats/c/messages/m/trace")
+        assert resp.status_code == 200
+        assert resp.json()["data"] == {"steps": [1]}
+
+    def test_message_from_other_chat_is_not_found(self):
+        message = ChatMessageDTO(id="m", chat_id="other", message_metadata='{"agent_trace": {}}')
+        resp = _client(message).get("/chats/c/messages/m/trace")
+        assert resp.status_code == 404
+
+    def test_missing_trace_is_not_found(self):
+        message = ChatMessageDTO(id="m", chat_id="c", message_metadata="{}")
+        resp = _client(message).get("/chats/c/messages/m/trace")
+        assert resp.status_code == 404
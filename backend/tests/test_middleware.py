@@ -0,0 +1,262 @@
+"""Tests for the unified response middleware."""
+
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+from pydantic import BaseModel, ValidationError
+
+from api.middleware import (
+    UNIFIED_HEADER,
+    SelectiveGZipMiddleware,
+    UnifiedResponseMiddleware,
+    _create_error_response,
+    _format_validation_error,
+    register_exception_handlers,
+    unified_response,
+)
+from exception import HTTPNotFoundException
+
+
+def _make_client() -> TestClient:
+    app = FastAPI()
+    register_exception_handlers(app)
+    app.add_middleware(UnifiedResponseMiddleware)
+
+    @app.get("/items")
+    async def items():
+        return {"items": [1, 2, 3], "name": "文档"}
+
+    @app.get("/stream")
+    async def stream():
+        async def gen():
+            yield b"event: ping\ndata: {}\n\n"
+
+        return StreamingResponse(gen(), media_type="text/event-stream")
+
+    @app.get("/download")
+    async def download():
+        return Response(
+            content=b'{"raw": true}',
+            media_type="application/json",
+            headers={"Content-Disposition": 'attachment; filename="a.json"'},
+        )
+
+    @app.delete("/items", status_code=204)
+    async def delete_items():
+        return Response(status_code=204, media_type="application/json")
+
+    @app.get("/text")
+    async def text():
+        return PlainTextResponse("hello")
+
+    @app.get("/boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    @app.get("/missing")
+    async def missing():
+        raise HTTPNotFoundException("Collection not found")
+
+    @app.get("/sized")
+    async def sized(size: int):
+        return {"size": size}
+
+    return TestClient(app, raise_server_exceptions=False)
+
+
+class TestUnifiedResponseMiddleware:
+    def test_wraps_json(self):
+        resp = _make_client().get("/items")
+        assert resp.status_code == 200
+        assert resp.json() == {
+            "code": "Success",
+            "message": "",
+            "data": {"items": [1, 2, 3], "name": "文档"},
+        }
+        assert int(resp.headers["content-length"]) == len(resp.content)
+
+    def test_envelope_is_valid_json_bytes(self):
+        resp = _make_client().get("/items")
+        assert json.loads(resp.content)["data"]["items"] == [1, 2, 3]
+
+    def test_sse_passthrough(self):
+        resp = _make_client().get("/stream")
+        assert resp.text == "event: ping\ndata: {}\n\n"
+
+    def test_attachment_passthrough(self):
+        resp = _make_client().get("/download")
+        assert resp.json() == {"raw": True}
+
+    def test_no_content_passthrough(self):
+        resp = _make_client().delete("/items")
+        assert resp.status_code == 204
+        assert resp.content == b""
+
+    def test_non_json_passthrough(self):
+        resp = _make_client().get("/text")
+        assert resp.text == "hello"
+
+    def test_unhandled_exception(self):
+        resp = _make_client().get("/boom")
+        assert resp.status_code == 500
+        assert resp.json()["code"] == "InternalError"
+
+    def test_http_exception(self):
+        resp = _make_client().get("/missing")
+        assert resp.status_code == 404
+        assert resp.json() == {
+            "code": "NotFound",
+            "message": "Collection not found",
+            "data": None,
+        }
+        assert UNIFIED_HEADER not in resp.headers
+
+    def test_request_validation_error(self):
+        resp = _make_client().get("/sized", params={"size": "big"})
+        assert resp.status_code == 422
+        assert resp.json()["code"] == "ValidationError"
+        assert resp.json()["message"].startswith("Validation error in field 'query -> size'")
+
+    def test_error_response_body(self):
+        resp = _create_error_response(404, "找不到")
+        assert resp.status_code == 404
+        assert json.loads(resp.body) == {"code": "NotFound", "message": "找不到", "data": None}
+
+    def test_prewrapped_passthrough(self):
+        app = FastAPI()
+        app.add_middleware(UnifiedResponseMiddleware)
+
+        @app.get("/health")
+        async def health():
+            return unified_response({"status": "ok"})
+
+        resp = TestClient(app).get("/health")
+        assert resp.json() == {"code": "Success", "message": "", "data": {"status": "ok"}}
+        assert UNIFIED_HEADER not in resp.headers
+        assert UNIFIED_HEADER not in _make_client().get("/boom").headers
+
+    def test_format_validation_error(self):
+        class Item(BaseModel):
+            name: str
+            size: int
+
+        with pytest.raises(ValidationError) as single:
+            Item(name="a", size="x")
+        assert _format_validation_error(single.value) == (
+            "Validation error in field 'size': "
+            "Input should be a valid integer, unable to parse string as an integer"
+        )
+
+        with pytest.raises(ValidationError) as multiple:
+            Item()
+        assert _format_validation_error(multiple.value) == (
+            "Validation failed with 2 errors"
+        )
+
+    def test_skip_routes_passthrough(self):
+        app = FastAPI()
+        app.add_middleware(UnifiedResponseMiddleware, skip_routes={"/raw/{name}"})
+
+        @app.get("/raw/{name}")
+        async def raw(name: str):
+            return {"name": name}
+
+        resp = TestClient(app).get("/raw/a")
+        assert resp.json() == {"name": "a"}
+
+    def test_skip_routes_strip_marker_header(self):
+        app = FastAPI()
+        register_exception_handlers(app)
+        app.add_middleware(UnifiedResponseMiddleware, skip_routes={"/stream/{name}", "/crash/{name}"})
+
+        @app.get("/stream/{name}")
+        async def stream(name: str):
+            raise HTTPNotFoundException(f"Chat '{name}' not found")
+
+        @app.get("/crash/{name}")
+        async def crash(name: str):
+            raise RuntimeError("boom")
+
+        client = TestClient(app, raise_server_exceptions=False)
+        resp = client.get("/stream/a")
+        assert resp.status_code == 404
+        assert resp.json()["code"] == "NotFound"
+        assert UNIFIED_HEADER not in resp.headers
+        resp = client.get("/crash/a")
+        assert resp.status_code == 500
+        assert UNIFIED_HEADER not in resp.headers
+
+    async def test_exception_after_buffered_chunk(self):
+        async def app(scope, receive, send):
+            await send({
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"application/json")],
+            })
+            await send({"type": "http.response.body", "body": b'{"a": ', "more_body": True})
+            raise RuntimeError("boom")
+
+        messages = []
+
+        async def send(message):
+            messages.append(message)
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        scope = {"type": "http", "method": "GET", "path": "/half", "headers": []}
+        await UnifiedResponseMiddleware(app)(scope, receive, send)
+
+        starts = [m for m in messages if m["type"] == "http.response.start"]
+        assert [m["status"] for m in starts] == [500]
+        body = b"".join(m.get("body", b"") for m in messages if m["type"] == "http.response.body")
+        assert json.loads(body)["code"] == "InternalError"
+
+    def test_unhandled_exception_logs_route(self, caplog):
+        with caplog.at_level("ERROR", logger="api.middleware"):
+            _make_client().get("/boom")
+        assert "Unhandled exception in GET /boom: boom" in caplog.text
+
+
+class TestSelectiveGZipMiddleware:
+    def _client(self) -> TestClient:
+        app = FastAPI()
+        app.add_middleware(SelectiveGZipMiddleware, minimum_size=16)
+        payload = b'{"text": "' + b"a" * 2048 + b'"}'
+
+        @app.get("/json")
+        async def json_body():
+            return Response(payload, media_type="application/json")
+
+        @app.get("/lines")
+        async def lines():
+            async def gen():
+                yield payload + b"\n"
+                yield payload + b"\n"
+
+            return StreamingResponse(gen(), media_type="application/x-ndjson")
+
+        @app.get("/download")
+        async def download():
+            return Response(
+                payload,
+                media_type="application/json",
+                headers={"Content-Disposition": 'attachment; filename="a.json"', "ETag": '"abc"'},
+            )
+
+        return TestClient(app)
+
+    def test_compresses_json(self):
+        resp = self._client().get("/json", headers={"Accept-Encoding": "gzip"})
+        assert resp.headers["content-encoding"] == "gzip"
+
+    def test_skips_ndjson_and_downloads(self):
+        client = self._client()
+        for path in ("/lines", "/download"):
+            resp = client.get(path, headers={"Accept-Encoding": "gzip"})
+            assert "content-encoding" not in resp.headers
+            assert resp.content.startswith(b'{"text": "aaa')
+        assert client.get("/download", headers={"Accept-Encoding": "gzip"}).headers["etag"] == '"abc"'
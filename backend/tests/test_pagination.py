@@ -0,0 +1,21 @@
+"""Tests for keyset pagination cursors."""
+
+import pytest
+
+from api.pagination import decode_cursor, encode_cursor
+from exception import HTTPBadRequestException
+
+
+class TestCursor:
+    def test_round_trip(self):
+        cursor = encode_cursor("2025-01-02T03:04:05+00:00", "doc-1")
+        assert "=" not in cursor
+        assert decode_cursor(cursor, 2) == ["2025-01-02T03:04:05+00:00", "doc-1"]
+
+    def test_rejects_garbage(self):
+        with pytest.raises(HTTPBadRequestException):
+            decode_cursor("not a cursor!", 2)
+
+    def test_rejects_wrong_arity(self):
+        with pytest.raises(HTTPBadRequestException):
+            decode_cursor(encode_cursor(1, "a", "b"), 2)
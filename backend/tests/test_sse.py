@@ -0,0 +1,51 @@
+"""Tests for raw SSE framing."""
+
+import asyncio
+
+import orjson
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.middleware import UnifiedResponseMiddleware
+from api.sse import PING_FRAME, sse_frame, sse_response, with_keepalive
+
+
+class TestSSE:
+    def test_frame(self):
+        frame = sse_frame("agent_thinking", orjson.dumps({"delta": "你好\n"}))
+        assert frame == b'event: agent_thinking\ndata: {"delta":"\xe4\xbd\xa0\xe5\xa5\xbd\\n"}\n\n'
+
+    def test_response_streams_frames_unwrapped(self):
+        app = FastAPI()
+        app.add_middleware(UnifiedResponseMiddleware)
+
+        @app.get("/stream")
+        async def stream():
+            async def frames():
+                yield sse_frame("status", b'{"ok":true}')
+                yield sse_frame("done", b"{}")
+
+            return sse_response(frames())
+
+        resp = TestClient(app).get("/stream")
+        assert resp.headers["content-type"].startswith("text/event-stream")
+        assert resp.headers["x-accel-buffering"] == "no"
+        assert resp.text == 'event: status\ndata: {"ok":true}\n\nevent: done\ndata: {}\n\n'
+
+    async def test_keepalive_pings_while_idle(self):
+        async def frames():
+            yield b"a"
+            await asyncio.sleep(0.05)
+            yield b"b"
+
+        out = [frame async for frame in with_keepalive(frames(), interval=0.02)]
+        assert out[0] == b"a" and out[-1] == b"b"
+        assert PING_FRAME in out[1:-1]
+
+    async def test_keepalive_silent_when_busy(self):
+        async def frames():
+            for frame in (b"a", b"b", b"c"):
+                yield frame
+
+        out = [frame async for frame in with_keepalive(frames(), interval=1.0)]
+        assert out == [b"a", b"b", b"c"]
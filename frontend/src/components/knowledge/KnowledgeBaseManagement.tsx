@@ -803,6 +803,18 @@ export const KnowledgeBaseManagement: React.FC<KnowledgeBaseManagementProps> = (
               }, 0)
             }
             break
+          case 'logs':
+            if (Array.isArray(event.data) && event.data.length > 0) {
+              const lines = event.data.map((logData: any) => {
+                const timestamp = logData.timestamp ? new Date(logData.timestamp).toLocaleTimeString() : new Date().toLocaleTimeString()
+                return `[${timestamp}] ${logData.message}`
+              })
+              setTaskLogs(prev => [...prev, ...lines])
+              setTimeout(() => {
+                if (logTextAreaRef.current) logTextAreaRef.current.scrollTop = logTextAreaRef.current.scrollHeight
+              }, 0)
+            }
+            break
           case 'done':
             setIsStreaming(false)
             loadDocuments()
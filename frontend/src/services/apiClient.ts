@@ -276,7 +276,7 @@ export class DocumentAssistantAPI {
         
         try {
           const errorJson = JSON.parse(errorText)
-          errorMessage = errorJson.detail || errorMessage
+          errorMessage = errorJson.message || errorJson.detail || errorMessage
         } catch {
           // Use the raw text if it's not JSON
           if (errorText) {
@@ -484,7 +484,7 @@ export class DocumentAssistantAPI {
         
         try {
           const errorJson = JSON.parse(errorText)
-          errorMessage = errorJson.detail || errorMessage
+          errorMessage = errorJson.message || errorJson.detail || errorMessage
         } catch {
           if (errorText) {
             errorMessage = errorText
@@ -748,9 +748,11 @@ export class DocumentAssistantAPI {
 
   /**
    * List chats
+   *
+   * `total` is null on cursor (keyset) pages unless the server is asked for it
    */
-  async listChats(offset: number = 0, limit: number = 50): Promise<APIResponse<{ chats: Chat[], offset: number, limit: number, total: number }>> {
-    return this.request<APIResponse<{ chats: Chat[], offset: number, limit: number, total: number }>>(
+  async listChats(offset: number = 0, limit: number = 50): Promise<APIResponse<{ chats: Chat[], offset: number, limit: number, total: number | null, next_cursor: string | null }>> {
+    return this.request<APIResponse<{ chats: Chat[], offset: number, limit: number, total: number | null, next_cursor: string | null }>>(
       `/api/v1/chats?offset=${offset}&limit=${limit}`
     )
   }